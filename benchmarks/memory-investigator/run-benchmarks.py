@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Measure memory-investigator snapshot latency against process count.
+
+Spawns batches of idle `sleep` processes so the host carries a known number
+of extra PIDs, then times two ways of gathering the per-process data a
+snapshot needs:
+
+- `legacy_process_iter`: the pre-walker approach, one `psutil.process_iter`
+  pass per collector plus an extra open of /proc/PID/status for VmLck.
+- `procfs_walker`: `ProcfsSnapshot.read()` from memory/memory-investigator.py,
+  which reads status and statm once per PID and shares them.
+
+Writes raw JSON with per-count timing so the two curves can be compared.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+from pathlib import Path
+
+import psutil
+
+REPO = Path(__file__).resolve().parents[2]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--out", required=True, help="Output JSON path")
+    parser.add_argument("--label", required=True, help="Human-readable machine label")
+    parser.add_argument(
+        "--counts",
+        default="0,250,500,1000,2000",
+        help="Comma-separated numbers of extra idle processes (default: 0,250,500,1000,2000)",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Timed runs per count (default: 5)")
+    return parser.parse_args()
+
+
+def load_investigator():
+    path = REPO / "memory" / "memory-investigator.py"
+    spec = importlib.util.spec_from_file_location("memory_investigator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def legacy_process_iter() -> int:
+    """Per-collector psutil scans, as collect_system_snapshot used to do them."""
+    seen = 0
+    for proc in psutil.process_iter(["pid", "name", "memory_info", "memory_percent", "cmdline"]):
+        seen += 1
+    for proc in psutil.process_iter(["pid", "name", "memory_info"]):
+        try:
+            with open(f"/proc/{proc.info['pid']}/status") as f:
+                for line in f:
+                    if line.startswith("VmLck:"):
+                        break
+        except OSError:
+            continue
+    sorted(psutil.process_iter(["pid", "memory_percent"]), key=lambda p: p.info["memory_percent"] or 0)
+    for proc in psutil.process_iter(["pid", "name"]):
+        pass
+    return seen
+
+
+def time_runs(fn, runs: int) -> dict[str, object]:
+    fn()  # warm-up
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return {
+        "runs_raw": samples,
+        "mean": statistics.mean(samples),
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    investigator = load_investigator()
+    counts = sorted(int(c) for c in args.counts.split(","))
+
+    children: list[subprocess.Popen] = []
+    results: list[dict[str, object]] = []
+    try:
+        for count in counts:
+            while len(children) < count:
+                children.append(subprocess.Popen(["sleep", "3600"]))
+            total = len(psutil.pids())
+            print(f"[{args.label}] extra={count} total_pids={total}", flush=True)
+            results.append(
+                {
+                    "extra_processes": count,
+                    "total_pids": total,
+                    "legacy_process_iter": time_runs(legacy_process_iter, args.runs),
+                    "procfs_walker": time_runs(investigator.ProcfsSnapshot.read, args.runs),
+                }
+            )
+    finally:
+        for child in children:
+            child.kill()
+        for child in children:
+            child.wait()
+
+    out = {
+        "metadata": {
+            "label": args.label,
+            "platform": platform.platform(),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "euid": os.geteuid(),
+        },
+        "results": results,
+    }
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(out, indent=2))
+    print(f"wrote {out_path}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
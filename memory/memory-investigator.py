@@ -7,320 +7,2055 @@ Collects detailed memory usage data over time for leak investigation
 import os
 import sys
 import time
+import math
+import signal
+import select
+import resource
+import threading
+import pwd
+from stat import filemode
+import io
+import gzip
+from array import array
+from bisect import bisect_left
+from collections import deque
 import json
+import re
 import psutil
 import argparse
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any
-import subprocess
+from typing import Dict, List, Any, Iterator, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Files and directories opened by the collectors, kept per thread so PidPool
+# workers never race on a shared counter; see files_opened()
+_open_counts: Dict[int, int] = {}
+
+
+def _count_open(n: int = 1):
+    ident = threading.get_ident()
+    _open_counts[ident] = _open_counts.get(ident, 0) + n
+
+
+def files_opened() -> int:
+    """Files and directories opened by the collectors so far, across all threads"""
+    return sum(_open_counts.values())
+
+
+def _read_proc_text(path: str) -> str:
+    """Read a procfs/sysfs pseudo-file in one go, returning '' if unavailable"""
+    _count_open()
+    try:
+        with open(path, 'r') as f:
+            return f.read()
+    except (OSError, ValueError):
+        return ''
+
+
+PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+
+
+class ProcessRecord:
+    """Per-process fields read from /proc/PID/status and statm in a single pass"""
+
+    __slots__ = ('pid', 'name', 'vmlck', 'rss', 'vms', 'shared', 'text', 'data',
+                 '_cmdline', '_starttime', '_cgroup')
+
+    def __init__(self, pid: int):
+        self.pid = pid
+        self.name = ''
+        self.vmlck = 0
+        self.rss = 0
+        self.vms = 0
+        self.shared = 0
+        self.text = 0
+        self.data = 0
+        self._cmdline = None
+        self._starttime = None
+        self._cgroup = None
+
+    @classmethod
+    def read(cls, pid: int) -> 'ProcessRecord':
+        """Read one process; raises OSError if it vanished or is inaccessible"""
+        record = cls(pid)
+        _count_open(2)
+        with open(f'/proc/{pid}/status', 'r') as f:
+            status = f.read()
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            statm = f.read().split()
+
+        for line in status.splitlines():
+            if line.startswith('Name:'):
+                # Names repeat across processes and ticks; keep one copy of each
+                record.name = sys.intern(line[5:].strip())
+            elif line.startswith('VmLck:'):
+                record.vmlck = int(line.split()[1]) * 1024
+                break
+
+        # statm: size resident shared text lib data dt (in pages)
+        if len(statm) >= 6:
+            record.vms = int(statm[0]) * PAGE_SIZE
+            record.rss = int(statm[1]) * PAGE_SIZE
+            record.shared = int(statm[2]) * PAGE_SIZE
+            record.text = int(statm[3]) * PAGE_SIZE
+            record.data = int(statm[5]) * PAGE_SIZE
+        return record
+
+    def cmdline(self) -> str:
+        """First three argv entries, read lazily since only reported processes need it"""
+        if self._cmdline is None:
+            argv = _read_proc_text(f'/proc/{self.pid}/cmdline').split('\0')
+            self._cmdline = sys.intern(' '.join(arg for arg in argv[:3] if arg))
+        return self._cmdline
+
+    def cgroup(self) -> str:
+        """Cgroup path (the v2 entry, else the v1 memory controller's), read lazily"""
+        if self._cgroup is None:
+            self._cgroup = ''
+            for line in _read_proc_text(f'/proc/{self.pid}/cgroup').splitlines():
+                hierarchy, controllers, path = line.split(':', 2)
+                if hierarchy == '0' and not controllers:
+                    self._cgroup = path
+                    break
+                if 'memory' in controllers.split(','):
+                    self._cgroup = path
+            self._cgroup = sys.intern(self._cgroup)
+        return self._cgroup
+
+    def starttime(self) -> int:
+        """Start time in clock ticks since boot (field 22 of /proc/PID/stat), read lazily
+
+        Together with the pid this identifies a process across PID reuse.
+        Returns 0 if the process has already exited.
+        """
+        if self._starttime is None:
+            stat = _read_proc_text(f'/proc/{self.pid}/stat')
+            # comm may contain spaces or parens; fields resume after the last ')'
+            fields = stat[stat.rfind(')') + 2:].split()
+            self._starttime = int(fields[19]) if len(fields) > 19 else 0
+        return self._starttime
+
+
+SMAPS_TOTAL_FIELDS = ('Rss', 'Pss', 'Swap', 'SwapPss', 'Locked')
+
+
+def read_smaps_totals(pid: int) -> Tuple[Dict[str, int], str]:
+    """Sum Rss/Pss/Swap/SwapPss/Locked (bytes) for a process
+
+    Reads /proc/PID/smaps_rollup, which the kernel pre-aggregates, and only
+    falls back to summing every mapping in /proc/PID/smaps on kernels older
+    than 4.14. Returns the totals and the file they came from.
+    """
+    totals = dict.fromkeys(SMAPS_TOTAL_FIELDS, 0)
+    for source in ('smaps_rollup', 'smaps'):
+        _count_open()
+        try:
+            with open(f'/proc/{pid}/{source}', 'r') as f:
+                for line in f:
+                    key, _, rest = line.partition(':')
+                    if key in totals:
+                        totals[key] += int(rest.split()[0]) * 1024
+            return totals, source
+        except FileNotFoundError:
+            if not os.path.exists(f'/proc/{pid}'):
+                raise
+    raise FileNotFoundError(f'/proc/{pid}/smaps')
+
+
+def parse_pressure(text: str) -> Dict[str, Dict[str, float]]:
+    """Parse a PSI file (/proc/pressure/* or a cgroup's *.pressure)
+
+    Returns {'some': {...}, 'full': {...}} with avg10/avg60/avg300 in percent
+    and total in microseconds of stall time; missing lines are omitted.
+    """
+    pressure = {}
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        kind, *fields = line.split()
+        pressure[kind] = {}
+        for field in fields:
+            name, _, value = field.partition('=')
+            pressure[kind][name] = int(value) if name == 'total' else float(value)
+    return pressure
+
+
+def reclaim_counters(vmstat: Dict[str, int]) -> Dict[str, int]:
+    """Cumulative reclaim work from /proc/vmstat, summed over reclaim paths and zones
+
+    pgscan/pgsteal add kswapd, direct, khugepaged and proactive reclaim
+    (pgscan_anon/pgscan_file split the same pages and are left out);
+    allocstall adds the per-zone counters, or uses the pre-4.x total.
+    """
+    counters = {'pgscan': 0, 'pgsteal': 0, 'allocstall': 0,
+                'compact_stall': vmstat.get('compact_stall', 0)}
+    for key, value in vmstat.items():
+        for prefix in ('pgscan', 'pgsteal'):
+            if key.startswith(prefix + '_') and key[len(prefix) + 1:] not in ('anon', 'file'):
+                counters[prefix] += value
+        if key == 'allocstall' or key.startswith('allocstall_'):
+            counters['allocstall'] += value
+    return counters
+
+
+ZONEINFO_FIELDS = {'nr_zone_unevictable': 'unevictable_pages', 'nr_mlock': 'mlocked',
+                   'nr_free_pages': 'free'}
+
+
+def read_zoneinfo() -> Dict[str, Dict[str, int]]:
+    """Per-zone unevictable, mlocked and free memory (bytes) keyed 'node<N>/<zone>'
+
+    The per-node stats block printed under each node's first zone is
+    skipped; NUMA_NODE_ROOT gives per-node totals.
+    """
+    zones = {}
+    current = None
+    for line in _read_proc_text('/proc/zoneinfo').splitlines():
+        fields = line.split()
+        if line.startswith('Node'):
+            # "Node 0, zone   Normal"
+            current = zones[f"node{fields[1].rstrip(',')}/{fields[3]}"] = {}
+        elif current is not None and len(fields) == 2 and fields[0] in ZONEINFO_FIELDS:
+            current[ZONEINFO_FIELDS[fields[0]]] = int(fields[1]) * PAGE_SIZE
+    return zones
+
+
+NUMA_NODE_ROOT = '/sys/devices/system/node'
+NODE_MEMINFO_FIELDS = ('MemTotal', 'MemFree', 'Unevictable', 'Mlocked', 'SReclaimable',
+                       'SUnreclaim', 'KernelStack', 'PageTables', 'Shmem')
+NODE_VMSTAT_FIELDS = ('nr_free_pages', 'nr_unevictable', 'nr_mlock',
+                      'nr_slab_reclaimable', 'nr_slab_unreclaimable')
+
+
+def read_numa_nodes(root: str = NUMA_NODE_ROOT) -> Dict[str, Dict[str, int]]:
+    """Per-node meminfo (bytes) and vmstat page counts (converted to bytes)"""
+    nodes = {}
+    try:
+        _count_open()
+        names = sorted((n for n in os.listdir(root) if n.startswith('node') and n[4:].isdigit()),
+                       key=lambda n: int(n[4:]))
+    except OSError:
+        return nodes
+    for name in names:
+        node = {}
+        # "Node 0 MemTotal:        4816632 kB"
+        for line in _read_proc_text(os.path.join(root, name, 'meminfo')).splitlines():
+            fields = line.split()
+            if len(fields) >= 4 and fields[2].rstrip(':') in NODE_MEMINFO_FIELDS:
+                node[fields[2].rstrip(':')] = int(fields[3]) * 1024
+        for line in _read_proc_text(os.path.join(root, name, 'vmstat')).splitlines():
+            fields = line.split()
+            if len(fields) == 2 and fields[0] in NODE_VMSTAT_FIELDS:
+                node[fields[0]] = int(fields[1]) * PAGE_SIZE
+        nodes[name] = node
+    return nodes
+
+
+def _user_name(uid: int) -> str:
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+def read_tmpfs_usage() -> List[Dict[str, Any]]:
+    """Size/used/available bytes of every tmpfs mount, via statvfs (what `df -t tmpfs` reports)"""
+    usage = {}  # by mount point: a later mount on the same path hides the earlier one
+    for line in _read_proc_text('/proc/self/mountinfo').splitlines():
+        # id parent major:minor root mountpoint options [optional...] - fstype source superoptions
+        fields, _, tail = line.partition(' - ')
+        fstype, source = (tail.split() + ['', ''])[:2]
+        if fstype != 'tmpfs':
+            continue
+        # Mount points escape space, tab, newline and backslash as octal
+        mountpoint = re.sub(r'\\([0-7]{3})', lambda m: chr(int(m.group(1), 8)), fields.split()[4])
+        try:
+            st = os.statvfs(mountpoint)
+        except OSError:
+            continue
+        size = st.f_blocks * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        available = st.f_bavail * st.f_frsize
+        usage[mountpoint] = {
+            'filesystem': source,
+            'size': size,
+            'used': used,
+            'available': available,
+            'use_percent': -(-used * 100 // (used + available)) if used + available else 0,
+            'mountpoint': mountpoint
+        }
+    return list(usage.values())
+
+
+def read_posix_shm(directory: str = '/dev/shm') -> List[Dict[str, Any]]:
+    """POSIX shared memory objects (files in /dev/shm)"""
+    objects = []
+    _count_open()
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    st = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                objects.append({
+                    'name': entry.name,
+                    'size': st.st_size,
+                    'permissions': filemode(st.st_mode),
+                    'owner': _user_name(st.st_uid)
+                })
+    except OSError:
+        pass
+    return objects
+
+
+SHM_DEST = 0o1000
+SHM_LOCKED = 0o2000
+
+
+def read_sysv_shm() -> List[Dict[str, Any]]:
+    """System V shared memory segments from /proc/sysvipc/shm (what `ipcs -m` reports)"""
+    segments = []
+    lines = _read_proc_text('/proc/sysvipc/shm').splitlines()
+    if not lines:
+        return segments
+    header = lines[0].split()
+    for line in lines[1:]:
+        row = dict(zip(header, line.split()))
+        if 'shmid' not in row:
+            continue
+        mode = int(row['perms'], 8)
+        segment = {
+            'shmid': row['shmid'],
+            'owner': _user_name(int(row['uid'])),
+            'perms': f"{mode & 0o777:o}",
+            'bytes': int(row['size']),
+            'nattch': row['nattch'],
+            'status': ' '.join(flag for bit, flag in ((SHM_DEST, 'dest'), (SHM_LOCKED, 'locked'))
+                               if mode & bit)
+        }
+        # Kernels since 4.x also report resident and swapped bytes; SHM_LOCKED
+        # segments are resident and count towards Unevictable
+        for field in ('rss', 'swap'):
+            if field in row:
+                segment[field] = int(row[field])
+        segments.append(segment)
+    return segments
+
+
+# Kernel log events counted per kind; the first matching pattern wins.
+# An OOM kill logs a long report, so only its "Killed process" line counts.
+KERNEL_EVENT_PATTERNS = [
+    ('oom_kill', re.compile(r'Killed process \d+')),
+    ('alloc_failure', re.compile(r'page allocation failure')),
+    ('mlock', re.compile(r'mlock.*fail|fail.*mlock', re.IGNORECASE)),
+    ('compaction', re.compile(r'\bcompact(ion|ing)?\b', re.IGNORECASE)),
+]
+KERNEL_EVENT_KINDS = tuple(kind for kind, _ in KERNEL_EVENT_PATTERNS)
+
+
+def classify_kernel_message(message: str) -> Optional[str]:
+    """Kind of memory event a kernel log message reports, or None"""
+    for kind, pattern in KERNEL_EVENT_PATTERNS:
+        if pattern.search(message):
+            return kind
+    return None
+
+
+class KmsgReader:
+    """Persistent non-blocking /dev/kmsg tailer with a sequence cursor
+
+    The device is opened lazily at the end of the ring buffer, so only
+    records logged after the first call are returned. `seq` is the sequence
+    number of the last record returned; records at or below it are never
+    returned twice, even across a reopen, and gaps in the sequence (records
+    the kernel overwrote before we read them) are added to `lost`.
+    """
+
+    def __init__(self, path: str = '/dev/kmsg'):
+        self.path = path
+        self.fd: Optional[int] = None
+        self.seq: Optional[int] = None
+        self.lost = 0
+
+    def _open(self):
+        _count_open()
+        self.fd = os.open(self.path, os.O_RDONLY | os.O_NONBLOCK)
+        if self.seq is None:
+            os.lseek(self.fd, 0, os.SEEK_END)
+            self.seq = -1
+
+    def read_new(self) -> List[Dict[str, Any]]:
+        """Records logged since the last call; raises OSError if unreadable
+
+        Each record is {'seq', 'priority', 'usec' (since boot), 'message'}.
+        """
+        if self.fd is None:
+            self._open()
+        records = []
+        while True:
+            try:
+                data = os.read(self.fd, 8192)  # one record per read
+            except BlockingIOError:
+                break
+            except BrokenPipeError:
+                continue  # overwritten before we got to it; the next read resumes at the oldest
+            if not data:
+                break
+            header, _, text = data.decode('utf-8', 'replace').partition(';')
+            fields = header.split(',')
+            try:
+                seq = int(fields[1])
+                priority = int(fields[0]) & 7
+                usec = int(fields[2])
+            except (IndexError, ValueError):
+                continue
+            if seq <= self.seq:
+                continue
+            if self.seq >= 0 and seq > self.seq + 1:
+                self.lost += seq - self.seq - 1
+            self.seq = seq
+            # Continuation lines (' KEY=value' device metadata) are dropped
+            records.append({'seq': seq, 'priority': priority, 'usec': usec,
+                            'message': text.split('\n', 1)[0]})
+        return records
+
+    def close(self):
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+
+
+SYSFS_SLAB_ROOT = '/sys/kernel/slab'
+
+
+def _first_int(path: str) -> int:
+    """Leading integer of a sysfs file such as '17136 N0=17136'"""
+    value = _read_proc_text(path).split(maxsplit=1)
+    return int(value[0]) if value and value[0].isdigit() else 0
+
+
+def read_sysfs_slab_caches(root: str = SYSFS_SLAB_ROOT) -> List[Dict[str, Any]]:
+    """Slab caches from SLUB's sysfs tree, for hosts where /proc/slabinfo is restricted
+
+    Merged caches appear as ':<flags>-<size>' directories with every
+    cache name as a symlink to them; each is reported once, under its
+    shortest alias.
+    """
+    directories = []
+    aliases: Dict[str, List[str]] = {}
+    try:
+        _count_open()
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if entry.is_symlink():
+                    aliases.setdefault(os.path.basename(os.readlink(entry.path)), []).append(entry.name)
+                elif entry.is_dir():
+                    directories.append(entry.name)
+    except OSError:
+        return []
+    caches = []
+    for directory in directories:
+        path = os.path.join(root, directory)
+        total_objects = _first_int(os.path.join(path, 'total_objects'))
+        object_size = _first_int(os.path.join(path, 'object_size'))
+        slabs = _first_int(os.path.join(path, 'slabs'))
+        caches.append({
+            'name': min(aliases.get(directory, [directory]), key=len),
+            'active_objects': _first_int(os.path.join(path, 'objects')),
+            'total_objects': total_objects,
+            'object_size': object_size,
+            'active_slabs': slabs,
+            'total_slabs': slabs,
+            'total_size': total_objects * object_size
+        })
+    return caches
+
+
+def read_slab_caches() -> Tuple[List[Dict[str, Any]], str]:
+    """Every slab cache and where it came from ('slabinfo', 'sysfs' or '' if neither is readable)"""
+    caches = []
+    for line in _read_proc_text('/proc/slabinfo').splitlines()[2:]:
+        # name active_objs num_objs objsize objperslab pagesperslab
+        #   : tunables limit batchcount sharedfactor : slabdata active_slabs num_slabs sharedavail
+        parts = line.split()
+        if len(parts) >= 15:
+            caches.append({
+                'name': parts[0],
+                'active_objects': int(parts[1]),
+                'total_objects': int(parts[2]),
+                'object_size': int(parts[3]),
+                'active_slabs': int(parts[13]),
+                'total_slabs': int(parts[14]),
+                'total_size': int(parts[2]) * int(parts[3])
+            })
+    if caches:
+        return caches, 'slabinfo'
+    caches = read_sysfs_slab_caches()
+    return caches, 'sysfs' if caches else ''
+
+
+class SlabTracker:
+    """Size history of every slab cache in flat arrays indexed by interned name
+
+    Holds each cache's total size (bytes) at the start of the run, at the
+    previous update and now, so per-tick and whole-run growth cost
+    O(caches) per update however long the run is. A cache created during
+    the run starts from 0; one that disappears counts as 0.
+    """
+
+    def __init__(self):
+        self.names = InternTable()
+        self.first = array('q')
+        self.previous = array('q')
+        self.current = array('q')
+        self.started: Optional[float] = None
+        self.updated: Optional[float] = None
+        self._latest: Dict[int, Dict[str, Any]] = {}
+
+    def update(self, caches: List[Dict[str, Any]], t: float):
+        """Fold in one full read of the slab caches taken at time t"""
+        initial = self.started is None
+        self.previous = self.current
+        self.current = array('q', bytes(self.current.itemsize * len(self.names)))
+        self._latest = {}
+        for cache in caches:
+            index = self.names.intern(cache['name'])
+            if index == len(self.current):
+                self.current.append(0)
+                self.previous.append(0)
+                self.first.append(0)
+            self.current[index] += cache['total_size']
+            self._latest[index] = cache
+        if initial:
+            self.started = t
+            self.first = array('q', self.current)
+            self.previous = array('q', self.current)
+        self.updated = t
+
+    def growth(self, index: int) -> int:
+        """Bytes gained since the previous update"""
+        return self.current[index] - self.previous[index]
+
+    def run_growth(self, index: int) -> int:
+        """Bytes gained since the first update"""
+        return self.current[index] - self.first[index]
+
+    def entries(self, largest: int = 20, growers: int = 10) -> List[Dict[str, Any]]:
+        """The largest caches plus the fastest growers (per tick and over the run), by size"""
+        indices = range(len(self.current))
+        chosen = set(sorted(indices, key=lambda i: self.current[i], reverse=True)[:largest])
+        chosen.update(sorted(indices, key=self.growth, reverse=True)[:growers])
+        chosen.update(sorted(indices, key=self.run_growth, reverse=True)[:growers])
+        hours = (self.updated - self.started) / 3600 if self.updated > self.started else None
+        entries = []
+        for index in chosen:
+            entry = dict(self._latest.get(index) or {'name': self.names[index], 'active_objects': 0,
+                                                     'total_objects': 0, 'object_size': 0,
+                                                     'active_slabs': 0, 'total_slabs': 0,
+                                                     'total_size': 0})
+            entry['growth'] = self.growth(index)
+            entry['run_growth'] = self.run_growth(index)
+            entry['run_growth_mb_per_hour'] = (round(entry['run_growth'] / (1024**2) / hours, 3)
+                                               if hours else 0.0)
+            entries.append(entry)
+        return sorted(entries, key=lambda e: e['total_size'], reverse=True)
+
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+CGROUP_STAT_FIELDS = ('anon', 'file', 'unevictable', 'slab', 'slab_unreclaimable', 'sock')
+
+
+def read_cgroup_memory(root: str = CGROUP_ROOT, max_depth: int = 3) -> Optional[List[Dict[str, Any]]]:
+    """Memory usage of every cgroup v2 unit down to `max_depth` levels below root
+
+    Reads memory.current, the CGROUP_STAT_FIELDS of memory.stat (bytes) and
+    memory.pressure once per unit. Returns None when `root` is not a cgroup
+    v2 (unified) hierarchy.
+    """
+    if not os.path.exists(os.path.join(root, 'cgroup.controllers')):
+        return None
+    units = []
+    stack = [(root, 0)]
+    while stack:
+        directory, depth = stack.pop()
+        if depth > 0:
+            current = _read_proc_text(os.path.join(directory, 'memory.current')).strip()
+            if not current.isdigit():
+                continue  # memory controller not enabled for this subtree
+            unit = {'path': directory[len(root):], 'current': int(current)}
+            stat = {}
+            for line in _read_proc_text(os.path.join(directory, 'memory.stat')).splitlines():
+                key, _, value = line.partition(' ')
+                stat[key] = value
+            for field in CGROUP_STAT_FIELDS:
+                unit[field] = int(stat.get(field, 0))
+            pressure = parse_pressure(_read_proc_text(os.path.join(directory, 'memory.pressure')))
+            for kind in ('some', 'full'):
+                unit[f'pressure_{kind}_avg10'] = pressure.get(kind, {}).get('avg10', 0.0)
+                unit[f'pressure_{kind}_total'] = pressure.get(kind, {}).get('total', 0)
+            units.append(unit)
+        if depth < max_depth:
+            _count_open()
+            try:
+                with os.scandir(directory) as entries:
+                    stack.extend((entry.path, depth + 1) for entry in entries
+                                 if entry.is_dir(follow_symlinks=False))
+            except OSError:
+                pass
+    return sorted(units, key=lambda u: u['current'], reverse=True)
+
+
+class PidPool:
+    """Shards per-PID procfs reads across a thread pool
+
+    procfs reads block in the kernel with the GIL released, so threads scale
+    on many-core hosts. PIDs are split into contiguous shards and results are
+    concatenated in shard order, so output is identical to a sequential walk.
+    With workers=1 everything runs inline on the calling thread.
+    """
+
+    def __init__(self, workers: int = 1):
+        self.workers = max(1, workers)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers) if self.workers > 1 else None
+
+    def map(self, fn, pids: List[int]) -> List[Any]:
+        """Apply fn to each pid, dropping processes that vanish or deny access"""
+        if self.executor is None or len(pids) < self.workers * 2:
+            return self._run_shard(fn, pids)
+        shard_size = -(-len(pids) // self.workers)
+        shards = [pids[i:i + shard_size] for i in range(0, len(pids), shard_size)]
+        results = []
+        for shard_result in self.executor.map(lambda shard: self._run_shard(fn, shard), shards):
+            results.extend(shard_result)
+        return results
+
+    @staticmethod
+    def _run_shard(fn, pids: List[int]) -> List[Any]:
+        results = []
+        for pid in pids:
+            try:
+                results.append(fn(pid))
+            except (OSError, ValueError):
+                continue
+        return results
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def list_pids() -> List[int]:
+    """All PIDs currently in /proc, in ascending order"""
+    _count_open()
+    return sorted(int(entry) for entry in os.listdir('/proc') if entry.isdigit())
+
+
+def walk_processes(pool: PidPool = None) -> List[ProcessRecord]:
+    """Read every process in /proc once, skipping those that exit mid-walk"""
+    return (pool or PidPool()).map(ProcessRecord.read, list_pids())
+
+
+class ProcfsSnapshot:
+    """System-wide procfs state read once per tick and shared by every collector
+
+    Each pseudo-file is opened exactly once per snapshot (including the
+    per-process status/statm files), so all sections of a snapshot describe
+    the same instant. Values are stored as the kernel reports them: meminfo
+    sizes in kB, counters and page counts as-is. `processes` is None on
+    ticks where no section needed the process table.
+    """
+
+    def __init__(self):
+        self.timestamp = datetime.now()
+        self.meminfo: Dict[str, int] = {}
+        self.vmstat: Dict[str, int] = {}
+        self.processes: Optional[List[ProcessRecord]] = None
+
+    @classmethod
+    def read(cls, pool: PidPool = None, processes: bool = True) -> 'ProcfsSnapshot':
+        """Read /proc/meminfo, /proc/vmstat and (optionally) the process table"""
+        snap = cls()
+        for line in _read_proc_text('/proc/meminfo').splitlines():
+            key, _, rest = line.partition(':')
+            fields = rest.split()
+            if fields and fields[0].isdigit():
+                snap.meminfo[key] = int(fields[0])
+        for line in _read_proc_text('/proc/vmstat').splitlines():
+            fields = line.split()
+            if len(fields) == 2 and fields[1].lstrip('-').isdigit():
+                snap.vmstat[fields[0]] = int(fields[1])
+        if processes:
+            snap.processes = walk_processes(pool)
+        return snap
+
+    def meminfo_bytes(self, key: str) -> int:
+        """Return a kB-sized meminfo field in bytes (0 if the kernel lacks it)"""
+        return self.meminfo.get(key, 0) * 1024
+
+
+def read_self_usage() -> Dict[str, int]:
+    """The investigator's own RSS, peak RSS, CPU time and I/O syscall counts so far
+
+    Reads /proc/self directly rather than through _read_proc_text so that
+    measuring does not show up in the collectors' open count.
+    """
+    usage = {
+        'rss': 0,
+        'peak_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+        'cpu_ns': time.process_time_ns(),
+        'files_opened': files_opened(),
+        'read_syscalls': 0,
+        'write_syscalls': 0,
+        'read_bytes': 0
+    }
+    try:
+        with open('/proc/self/statm', 'r') as f:
+            usage['rss'] = int(f.read().split()[1]) * PAGE_SIZE
+        # ru_maxrss is only raised when the kernel syncs its RSS counters
+        usage['peak_rss'] = max(usage['peak_rss'], usage['rss'])
+        # Needs CONFIG_TASK_IO_ACCOUNTING; the counters stay 0 without it
+        with open('/proc/self/io', 'r') as f:
+            io_counters = dict(line.split(': ') for line in f.read().splitlines())
+        usage['read_syscalls'] = int(io_counters.get('syscr', 0))
+        usage['write_syscalls'] = int(io_counters.get('syscw', 0))
+        usage['read_bytes'] = int(io_counters.get('rchar', 0))
+    except (OSError, ValueError, IndexError):
+        pass
+    return usage
+
+
+def section_is_fresh(snapshot: Dict[str, Any], key: str) -> bool:
+    """Whether a snapshot section was collected on its tick rather than carried forward"""
+    return snapshot.get('sections', {}).get(key, {}).get('fresh', True)
+
+
+def snapshot_weight(snapshot: Dict[str, Any]) -> float:
+    """Share of a regular tick a snapshot stands for (below 1 for PSI burst samples)"""
+    return snapshot.get('tick', {}).get('weight', 1.0)
+
+
+LOG_SUFFIXES = {'none': '.ndjson', 'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst'}
+
+
+def _process_identity(proc: Dict[str, Any]) -> Tuple[int, int]:
+    """(pid, starttime): unique per boot, so a recycled PID is a new process"""
+    return proc['pid'], proc.get('starttime', 0)
+
+
+class InternTable:
+    """Maps repeated strings (process names, cmdlines, cgroups) to small ids
+
+    Long runs see the same few hundred names thousands of times; tables
+    that hold an id per process keep each distinct string exactly once.
+    """
+
+    __slots__ = ('ids', 'values')
+
+    def __init__(self, values: List[str] = None):
+        self.values: List[str] = list(values or [])
+        self.ids: Dict[str, int] = {value: i for i, value in enumerate(self.values)}
+
+    def intern(self, value: str) -> int:
+        """Id of `value`, adding it on first sight"""
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+    def __getitem__(self, index: int) -> str:
+        return self.values[index]
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class SnapshotDeltaEncoder:
+    """Turns full snapshots into keyframe or delta log records
+
+    Every `keyframe_interval`-th record is a keyframe holding the complete
+    snapshot. Other records omit sections that were carried forward rather
+    than collected, and store the process table as a delta against the
+    previous record: only processes that appeared or whose fields changed
+    (with just the changed fields) plus the identities of exited processes.
+    """
+
+    def __init__(self, keyframe_interval: int = 60):
+        self.keyframe_interval = keyframe_interval
+        self.records = 0
+        self._previous: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def encode(self, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """Return the record to log for this snapshot (the snapshot is not modified)"""
+        keyframe = self.records % self.keyframe_interval == 0
+        self.records += 1
+        current = {_process_identity(p): p for p in snapshot.get('processes') or []}
+        if keyframe:
+            record = dict(snapshot, record_type='keyframe')
+            self._previous = current
+            return record
+
+        record = {
+            key: value for key, value in snapshot.items()
+            if key == 'processes' or section_is_fresh(snapshot, key)
+        }
+        record['record_type'] = 'delta'
+        changed = []
+        for identity, proc in current.items():
+            previous = self._previous.get(identity)
+            if previous is None:
+                changed.append(proc)
+                continue
+            fields = {key: value for key, value in proc.items() if previous.get(key) != value}
+            if fields:
+                fields['pid'], fields['starttime'] = identity
+                changed.append(fields)
+        exited = [list(identity) for identity in self._previous if identity not in current]
+        record['processes'] = {'changed': changed, 'exited': exited}
+        self._previous = current
+        return record
+
+
+class SnapshotDeltaDecoder:
+    """Rebuilds full snapshots from the records written by SnapshotDeltaEncoder
+
+    Must be fed records in log order starting at a keyframe. Records written
+    without delta encoding pass through unchanged.
+    """
+
+    def __init__(self):
+        self._sections: Dict[str, Any] = {}
+        self._processes: Dict[Tuple[int, int], Dict[str, Any]] = {}
+
+    def decode(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        record_type = record.pop('record_type', None)
+        if record_type != 'delta':
+            self._sections = dict(record)
+            self._processes = {_process_identity(p): p for p in record.get('processes') or []}
+            return record
+
+        delta = record.pop('processes')
+        for identity in delta['exited']:
+            self._processes.pop(tuple(identity), None)
+        for fields in delta['changed']:
+            identity = _process_identity(fields)
+            self._processes[identity] = dict(self._processes.get(identity, {}), **fields)
+
+        snapshot = dict(self._sections, **record)
+        # The table is ordered by RSS, ties in PID order, exactly as collected
+        snapshot['processes'] = sorted(self._processes.values(), key=lambda p: (-p['rss'], p['pid']))
+        self._sections = snapshot
+        return snapshot
+
+
+class SnapshotLog:
+    """Append-only log of snapshots, one compact JSON record per line
+
+    Uncompressed logs are flushed after every record. Compressed logs buffer
+    up to `block_size` records or `block_seconds` of wall time, whichever
+    comes first, and write each block as an independent gzip member or zstd
+    frame, so a crash loses at most the current block and readers can decode
+    the file as one continuous stream.
+    """
+
+    def __init__(self, path: Path, compression: str = 'none', block_size: int = 64,
+                 keyframe_interval: int = 60, block_seconds: float = 60.0):
+        if compression == 'zstd' and zstandard is None:
+            raise RuntimeError("zstd compression requires the zstandard module")
+        self.path = path
+        self.compression = compression
+        self.block_size = block_size
+        self.block_seconds = block_seconds
+        self.encoder = SnapshotDeltaEncoder(keyframe_interval) if keyframe_interval > 0 else None
+        self.records = 0
+        self._pending: List[bytes] = []
+        self._block_started = 0.0  # monotonic time of the oldest pending record
+        self._file = open(path, 'wb')
+
+    def append(self, snapshot: Dict[str, Any]):
+        """Append one snapshot record"""
+        record = self.encoder.encode(snapshot) if self.encoder else snapshot
+        line = json.dumps(record, separators=(',', ':')).encode() + b'\n'
+        self.records += 1
+        if self.compression == 'none':
+            self._file.write(line)
+            self._file.flush()
+            return
+        if not self._pending:
+            self._block_started = time.monotonic()
+        self._pending.append(line)
+        if (len(self._pending) >= self.block_size
+                or time.monotonic() - self._block_started >= self.block_seconds):
+            self.flush()
+
+    def flush(self):
+        """Write any buffered records out as one compressed block"""
+        if not self._pending:
+            return
+        block = b''.join(self._pending)
+        if self.compression == 'gzip':
+            self._file.write(gzip.compress(block))
+        else:
+            self._file.write(zstandard.ZstdCompressor().compress(block))
+        self._file.flush()
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        self._file.close()
+
+
+def _open_log(path: Path):
+    if path.suffix == '.gz':
+        stream = gzip.open(path, 'rt')
+    elif path.suffix == '.zst':
+        if zstandard is None:
+            raise RuntimeError("reading a zstd log requires the zstandard module")
+        raw = open(path, 'rb')
+        reader = zstandard.ZstdDecompressor().stream_reader(raw, read_across_frames=True, closefd=True)
+        stream = io.TextIOWrapper(reader)
+    else:
+        stream = open(path, 'r')
+    return stream
+
+
+def iter_snapshots(path: Path) -> Iterator[Dict[str, Any]]:
+    """Lazily yield full snapshots from a log written by SnapshotLog"""
+    decoder = SnapshotDeltaDecoder()
+    with _open_log(Path(path)) as stream:
+        for line in stream:
+            if line.strip():
+                yield decoder.decode(json.loads(line))
+
+
+def read_snapshot(path: Path, index: int) -> Optional[Dict[str, Any]]:
+    """Reconstruct the snapshot at position `index` in a log
+
+    Lines before the nearest preceding keyframe are skipped without being
+    parsed, so the cost is bounded by the keyframe interval.
+    """
+    pending: List[str] = []
+    with _open_log(Path(path)) as stream:
+        for position, line in enumerate(stream):
+            if '"record_type":"delta"' not in line:
+                pending = []
+            pending.append(line)
+            if position == index:
+                decoder = SnapshotDeltaDecoder()
+                snapshot = None
+                for record in pending:
+                    snapshot = decoder.decode(json.loads(record))
+                return snapshot
+    return None
+
+
+class MetricStore:
+    """Columnar time-series store for scalar snapshot metrics
+
+    Every column is a flat little-endian binary file (<name>.bin) holding one
+    fixed-width value per row, so a column can be memory-mapped and sliced
+    without parsing anything. index.json lists the columns, their array
+    typecodes, the row counts and the process key table.
+
+    System columns (timestamp, weight, meminfo.*, vmstat.*, psi.*,
+    numa.<node>.*, kernel_events.<kind> run totals) get one row per
+    snapshot; the column set is fixed by the first snapshot. weight is the
+    share of a regular tick the row stands for (burst rows are
+    burst_interval / interval), so readers can average by time rather than
+    by row. Process columns are stored in long
+    form (process.sample, process.key, rss, pss, vmlck) with one row per
+    reported process per fresh process table; process.key indexes the
+    (pid, starttime, name, cmdline, cgroup) table so PID reuse never merges
+    two processes; the strings in that table are ids into index.json's
+    'strings' list.
+    process.pss is -1 when PSS is unknown for that row (memory_locks was
+    not collected fresh on that tick, or smaps was unreadable); filter it
+    out before aggregating. Values are buffered and written every
+    `flush_rows` snapshots.
+    """
+
+    PSI_COLUMNS = {'psi.some_avg10': 'd', 'psi.full_avg10': 'd',
+                   'psi.some_total': 'q', 'psi.full_total': 'q'}
+    NUMA_FIELDS = ('MemFree', 'Unevictable', 'Mlocked', 'SUnreclaim')
+    PROCESS_COLUMNS = {'process.sample': 'I', 'process.key': 'I', 'process.rss': 'q',
+                       'process.pss': 'q', 'process.vmlck': 'q'}
+
+    def __init__(self, directory: Path, flush_rows: int = 60):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.flush_rows = flush_rows
+        self.columns: Dict[str, str] = {}  # name -> array typecode
+        self.rows = 0
+        self.process_rows = 0
+        self.process_keys: List[List[int]] = []
+        self.strings = InternTable()
+        self._key_index: Dict[Tuple[int, int], int] = {}
+        self._buffers: Dict[str, array] = {}
+        self._pending_rows = 0
+
+    def _add_column(self, name: str, typecode: str):
+        self.columns[name] = typecode
+        self._buffers[name] = array(typecode)
+
+    def append(self, snapshot: Dict[str, Any]):
+        """Add one snapshot's scalar metrics"""
+        meminfo = snapshot.get('kernel_memory') or {}
+        vmstat = snapshot.get('virtual_memory') or {}
+        pressure = snapshot.get('pressure') or {}
+        numa = snapshot.get('numa') or {}
+        event_counts = (snapshot.get('kernel_events') or {}).get('counts', {})
+        if not self.columns:
+            self._add_column('timestamp', 'd')
+            self._add_column('weight', 'd')
+            for key in sorted(meminfo):
+                self._add_column(f'meminfo.{key}', 'q')
+            for key in sorted(vmstat):
+                self._add_column(f'vmstat.{key}', 'q')
+            for name, typecode in self.PSI_COLUMNS.items():
+                self._add_column(name, typecode)
+            for node in numa:
+                for field in self.NUMA_FIELDS:
+                    self._add_column(f'numa.{node}.{field}', 'q')
+            for kind in KERNEL_EVENT_KINDS:
+                self._add_column(f'kernel_events.{kind}', 'q')
+            for name, typecode in self.PROCESS_COLUMNS.items():
+                self._add_column(name, typecode)
+
+        buffers = self._buffers
+        buffers['timestamp'].append(datetime.fromisoformat(snapshot['timestamp']).timestamp())
+        if 'weight' in buffers:
+            buffers['weight'].append(snapshot_weight(snapshot))
+        for name in self.columns:
+            if name.startswith('meminfo.'):
+                buffers[name].append(meminfo.get(name[8:], 0))
+            elif name.startswith('vmstat.'):
+                buffers[name].append(vmstat.get(name[7:], 0))
+            elif name.startswith('psi.'):
+                kind, _, field = name[4:].partition('_')
+                buffers[name].append(pressure.get(kind, {}).get(field, 0))
+            elif name.startswith('numa.'):
+                _, node, field = name.split('.')
+                buffers[name].append(numa.get(node, {}).get(field, 0))
+            elif name.startswith('kernel_events.'):
+                buffers[name].append(event_counts.get(name[14:], 0))
+
+        if section_is_fresh(snapshot, 'processes') and snapshot.get('processes'):
+            pss_by_pid = {}
+            locks = snapshot.get('memory_locks')
+            if locks and section_is_fresh(snapshot, 'memory_locks'):
+                pss_by_pid = {p['pid']: p['pss'] for p in locks.get('process_smaps_totals', [])}
+            strings = self.strings
+            for proc in snapshot['processes']:
+                identity = _process_identity(proc)
+                key = self._key_index.get(identity)
+                if key is None:
+                    key = self._key_index[identity] = len(self.process_keys)
+                    self.process_keys.append([*identity, strings.intern(proc['name']),
+                                              strings.intern(proc.get('cmdline', '')),
+                                              strings.intern(proc.get('cgroup', ''))])
+                buffers['process.sample'].append(self.rows)
+                buffers['process.key'].append(key)
+                buffers['process.rss'].append(proc['rss'])
+                buffers['process.pss'].append(pss_by_pid.get(proc['pid'], -1))  # -1: unknown
+                buffers['process.vmlck'].append(proc.get('vmlck', 0))
+                self.process_rows += 1
+
+        self.rows += 1
+        self._pending_rows += 1
+        if self._pending_rows >= self.flush_rows:
+            self.flush()
+
+    def flush(self):
+        """Append buffered values to the column files and rewrite the index"""
+        if not self.columns:
+            return
+        for name, buffer in self._buffers.items():
+            if buffer:
+                if sys.byteorder != 'little':
+                    buffer.byteswap()
+                with open(self.directory / f'{name}.bin', 'ab') as f:
+                    buffer.tofile(f)
+                self._buffers[name] = array(self.columns[name])
+        index = {
+            'version': 2,
+            'collector_pid': os.getpid(),
+            'rows': self.rows,
+            'process_rows': self.process_rows,
+            'columns': self.columns,
+            'process_keys': self.process_keys,
+            'strings': self.strings.values
+        }
+        tmp = self.directory / 'index.json.tmp'
+        tmp.write_text(json.dumps(index))
+        tmp.replace(self.directory / 'index.json')
+        self._pending_rows = 0
+
+    close = flush
+
+
+class MetricReader:
+    """Read-side view of a MetricStore directory
+
+    Columns come back as read-only numpy memmaps when numpy is installed,
+    otherwise as array.array loaded from disk.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        index = json.loads((self.directory / 'index.json').read_text())
+        self.rows = index['rows']
+        self.process_rows = index['process_rows']
+        self.columns: Dict[str, str] = index['columns']
+        self.collector_pid = index.get('collector_pid')  # the investigator that wrote the store
+        self.strings = InternTable(index.get('strings'))
+        if index.get('version', 1) >= 2:
+            # [pid, starttime, name, cmdline, cgroup] with the strings resolved
+            self.process_keys = [[pid, starttime, *(self.strings[i] for i in ids)]
+                                 for pid, starttime, *ids in index['process_keys']]
+        else:
+            self.process_keys = [[pid, starttime, name, '', '']
+                                 for pid, starttime, name in index['process_keys']]
+
+    def column(self, name: str):
+        """Load one column (only the rows covered by the index)"""
+        typecode = self.columns[name]
+        length = self.process_rows if name.startswith('process.') else self.rows
+        path = self.directory / f'{name}.bin'
+        if np is not None:
+            if length == 0:
+                return np.empty(0, dtype=np.dtype(typecode).newbyteorder('<'))
+            return np.memmap(path, dtype=np.dtype(typecode).newbyteorder('<'), mode='r', shape=(length,))
+        values = array(typecode)
+        with open(path, 'rb') as f:
+            values.fromfile(f, length)
+        if sys.byteorder != 'little':
+            values.byteswap()
+        return values
+
+    def process_series(self, pid: int, starttime: int, field: str = 'rss') -> Tuple[List[float], List[int]]:
+        """Timestamps and values of one process metric (rss, pss or vmlck); pss is -1 where unknown"""
+        key = next((i for i, (kpid, kstart, *_) in enumerate(self.process_keys)
+                    if kpid == pid and kstart == starttime), None)
+        if key is None:
+            return [], []
+        timestamps = self.column('timestamp')
+        samples = self.column('process.sample')
+        keys = self.column('process.key')
+        values = self.column(f'process.{field}')
+        if np is not None:
+            mask = keys == key
+            return timestamps[samples[mask]].tolist(), values[mask].tolist()
+        rows = [i for i, k in enumerate(keys) if k == key]
+        return [timestamps[samples[i]] for i in rows], [values[i] for i in rows]
+
+    def weights(self):
+        """Per-row weight column; every row counts once in stores written before it existed"""
+        if 'weight' in self.columns:
+            return self.column('weight')
+        if np is not None:
+            return np.ones(self.rows)
+        return array('d', [1.0]) * self.rows
+
+    def downsample(self, name: str, buckets: int) -> List[Tuple[float, float, float, float]]:
+        """Split a system column into equal time buckets of (start time, min, mean, max)
+
+        Buckets cover equal wall time, not equal row counts, so a PSI burst
+        only fills the buckets it happened in; empty buckets are left out.
+        The mean is weighted by row weight.
+        """
+        timestamps = self.column('timestamp')
+        values = self.column(name)
+        if self.rows == 0:
+            return []
+        weights = self.weights()
+        buckets = max(1, min(buckets, self.rows))
+        first, span = float(timestamps[0]), float(timestamps[-1] - timestamps[0])
+        if span <= 0:
+            buckets = 1
+        edges = [0] + [bisect_left(timestamps, first + span * i / buckets) for i in range(1, buckets)]
+        edges.append(self.rows)
+        result = []
+        for i, (start, end) in enumerate(zip(edges, edges[1:])):
+            if start >= end:
+                continue
+            chunk, chunk_weights = values[start:end], weights[start:end]
+            if np is not None:
+                mean = float(np.average(chunk, weights=chunk_weights))
+                result.append((first + span * i / buckets, float(chunk.min()), mean, float(chunk.max())))
+            else:
+                mean = sum(v * w for v, w in zip(chunk, chunk_weights)) / sum(chunk_weights)
+                result.append((first + span * i / buckets, min(chunk), mean, max(chunk)))
+        return result
+
+
+class LeakDetector:
+    """Robust growth estimates for every series in a MetricStore
+
+    Each series is reduced to `buckets` equal wall-time buckets (weighted
+    mean time and mean value, so burst rows do not outvote regular ticks),
+    then fitted with the Theil-Sen estimator: the median of the
+    slopes between every pair of buckets, so a few spikes or drops cannot
+    fake or hide a trend. Confidence is Kendall's tau between time and
+    value, i.e. how consistently the pairwise slopes agree in sign (1.0 for
+    a strictly monotonic series, ~0 for noise).
+
+    A slope over a few minutes is mostly start-up noise, so leaks() only
+    reports series observed for at least `min_span_s` that grew by at
+    least `min_growth_mb` over that span, and never the investigator
+    itself (its warm-up looks like a steep leak in short runs).
+
+    All series of one kind are fitted together as a (series x pairs)
+    matrix, in blocks of `block` series to bound memory. Needs numpy.
+    """
+
+    PROCESS_FIELDS = ('rss', 'pss', 'vmlck')
+    SYSTEM_COLUMNS = ('meminfo.Unevictable', 'meminfo.Mlocked', 'meminfo.SUnreclaim')
+
+    def __init__(self, reader: MetricReader, buckets: int = 48, block: int = 1024):
+        self.reader = reader
+        self.buckets = buckets
+        self.block = block
+
+    def _fit(self, rows, keys, values, nkeys: int):
+        """Per-key (slope/s, confidence, buckets with data, last value, observed seconds)"""
+        timestamps = np.asarray(self.reader.column('timestamp'), dtype=np.float64)
+        rows = np.asarray(rows, dtype=np.int64)
+        keys = np.asarray(keys, dtype=np.int64)
+        values = np.asarray(values, dtype=np.float64)
+        known = values >= 0  # process.pss stores -1 when unknown
+        rows, keys, values = rows[known], keys[known], values[known]
+
+        buckets = max(2, min(self.buckets, self.reader.rows))
+        span = timestamps[-1] - timestamps[0] if len(timestamps) else 0.0
+        if span > 0:
+            row_bucket = np.minimum(((timestamps - timestamps[0]) * (buckets / span)).astype(np.int64),
+                                    buckets - 1)
+        else:
+            row_bucket = np.zeros(len(timestamps), dtype=np.int64)
+        cell = keys * buckets + row_bucket[rows]
+        weights = np.asarray(self.reader.weights(), dtype=np.float64)[rows]
+        counts = np.bincount(cell, minlength=nkeys * buckets).reshape(nkeys, buckets)
+        totals = np.bincount(cell, weights, nkeys * buckets).reshape(nkeys, buckets)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            t = np.bincount(cell, timestamps[rows] * weights, nkeys * buckets).reshape(nkeys, buckets) / totals
+            v = np.bincount(cell, values * weights, nkeys * buckets).reshape(nkeys, buckets) / totals
+        last = np.full(nkeys, np.nan)
+        last[keys] = values  # rows are chronological, so the newest sample wins
+        sample_times = timestamps[rows]
+        first_seen = np.full(nkeys, np.nan)
+        first_seen[keys[::-1]] = sample_times[::-1]
+        last_seen = np.full(nkeys, np.nan)
+        last_seen[keys] = sample_times
+
+        slope = np.full(nkeys, np.nan)
+        confidence = np.zeros(nkeys)
+        present = (counts > 0).sum(axis=1)
+        first, second = np.triu_indices(buckets, 1)
+        candidates = np.flatnonzero(present >= 3)
+        for start in range(0, len(candidates), self.block):
+            chunk = candidates[start:start + self.block]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                pairs = (v[chunk][:, second] - v[chunk][:, first]) / (t[chunk][:, second] - t[chunk][:, first])
+            pairs[~np.isfinite(pairs)] = np.nan
+            slope[chunk] = np.nanmedian(pairs, axis=1)
+            valid = np.isfinite(pairs).sum(axis=1)
+            confidence[chunk] = np.abs(np.nansum(np.sign(pairs), axis=1)) / np.maximum(valid, 1)
+        return slope, confidence, present, last, last_seen - first_seen
+
+    def process_growth(self) -> List[Dict[str, Any]]:
+        """Fitted growth of every process series (one entry per process and field)"""
+        reader = self.reader
+        nkeys = len(reader.process_keys)
+        if nkeys == 0 or reader.process_rows == 0:
+            return []
+        rows = reader.column('process.sample')
+        keys = reader.column('process.key')
+        results = []
+        for field in self.PROCESS_FIELDS:
+            slope, confidence, present, last, span = self._fit(
+                rows, keys, reader.column(f'process.{field}'), nkeys)
+            for key in np.flatnonzero(np.isfinite(slope)):
+                pid, starttime, name, _, cgroup = reader.process_keys[key]
+                results.append({
+                    'pid': pid, 'starttime': starttime, 'name': name, 'cgroup': cgroup, 'metric': field,
+                    'mb_per_hour': float(slope[key]) * 3600 / (1024**2),
+                    'confidence': float(confidence[key]),
+                    'buckets': int(present[key]),
+                    'last_mb': float(last[key]) / (1024**2),
+                    'span_s': float(span[key]),
+                    'growth_mb': float(slope[key] * span[key]) / (1024**2)
+                })
+        return results
+
+    def system_growth(self) -> List[Dict[str, Any]]:
+        """Fitted growth of the system-wide unevictable and unreclaimable slab columns"""
+        reader = self.reader
+        rows = np.arange(reader.rows)
+        keys = np.zeros(reader.rows, dtype=np.int64)
+        results = []
+        for column in self.SYSTEM_COLUMNS:
+            if column not in reader.columns or reader.rows == 0:
+                continue
+            slope, confidence, present, last, span = self._fit(rows, keys, reader.column(column), 1)
+            if np.isfinite(slope[0]):
+                results.append({
+                    'metric': column.split('.', 1)[1],
+                    'mb_per_hour': float(slope[0]) * 3600 / (1024**2),
+                    'confidence': float(confidence[0]),
+                    'buckets': int(present[0]),
+                    'last_mb': float(last[0]) / (1024**2),
+                    'span_s': float(span[0]),
+                    'growth_mb': float(slope[0] * span[0]) / (1024**2)
+                })
+        return results
+
+    def leaks(self, min_mb_per_hour: float = 1.0, min_confidence: float = 0.6,
+              min_span_s: float = 600.0, min_growth_mb: float = 4.0) -> List[Dict[str, Any]]:
+        """Process series growing faster than `min_mb_per_hour` with at least `min_confidence`
+
+        Series seen for less than `min_span_s`, or whose fitted growth over
+        that span is under `min_growth_mb`, are not reported, nor is the
+        investigator that wrote the store (or the one reading it).
+        """
+        investigators = {os.getpid(), self.reader.collector_pid}
+        suspects = [g for g in self.process_growth()
+                    if g['pid'] not in investigators
+                    and g['span_s'] >= min_span_s and g['growth_mb'] >= min_growth_mb
+                    and g['mb_per_hour'] >= min_mb_per_hour and g['confidence'] >= min_confidence]
+        return sorted(suspects, key=lambda g: g['mb_per_hour'] * g['confidence'], reverse=True)
+
+
+class RunningStats:
+    """O(1)-per-sample summary of one metric series
+
+    Tracks count, min/max, first/last, Welford mean and variance, an EWMA,
+    and the least-squares slope of value against time (via a running
+    co-moment), so no history needs to be kept to describe a trend.
+
+    Samples carry a weight (1.0 for a regular tick): mean, variance, slope
+    and EWMA decay are weighted by it, so a burst of closely spaced samples
+    counts for the time it covered rather than for its sample count.
+    """
+
+    __slots__ = ('n', 'weight', 'mean', 'm2', 'min', 'max', 'first', 'last', 'ewma', 'alpha',
+                 't_first', 't_last', 't_mean', 't_m2', 'co_moment')
+
+    def __init__(self, alpha: float = 0.2):
+        self.alpha = alpha
+        self.n = 0
+        self.weight = 0.0
+        self.mean = self.m2 = 0.0
+        self.min = self.max = self.first = self.last = self.ewma = None
+        self.t_first = self.t_last = None
+        self.t_mean = self.t_m2 = self.co_moment = 0.0
+
+    def update(self, t: float, value: float, weight: float = 1.0):
+        """Add a sample taken at time t (seconds) standing for `weight` regular ticks"""
+        self.n += 1
+        if self.n == 1:
+            self.min = self.max = self.first = self.ewma = value
+            self.t_first = t
+        else:
+            self.min = min(self.min, value)
+            self.max = max(self.max, value)
+            self.ewma += (1 - (1 - self.alpha) ** weight) * (value - self.ewma)
+        self.last = value
+        self.t_last = t
+        self.weight += weight
+        share = weight / self.weight
+        dt = t - self.t_mean
+        dy = value - self.mean
+        self.t_mean += dt * share
+        self.mean += dy * share
+        self.m2 += weight * dy * (value - self.mean)
+        self.t_m2 += weight * dt * (t - self.t_mean)
+        self.co_moment += weight * dt * (value - self.mean)
+
+    @property
+    def stddev(self) -> float:
+        # Reduces to the sample (n - 1) variance when every weight is 1
+        return (self.m2 / self.weight * self.n / (self.n - 1)) ** 0.5 if self.n > 1 else 0.0
+
+    @property
+    def slope(self) -> float:
+        """Least-squares growth in value units per second"""
+        return self.co_moment / self.t_m2 if self.t_m2 > 0 else 0.0
+
+    @property
+    def span(self) -> float:
+        return (self.t_last - self.t_first) if self.n else 0.0
+
+    @property
+    def change(self) -> float:
+        return (self.last - self.first) if self.n else 0.0
+
+
+class OnlineAnalyzer:
+    """Trend statistics updated once per snapshot
+
+    Holds a RunningStats per system metric and per process, plus the
+    collection-cost counters, so leak suspects can be listed at any point of
+    a live run and the final report needs no pass over snapshot history.
+    """
+
+    # name -> (snapshot section, field), all in bytes
+    SYSTEM_METRICS = {
+        'unevictable': ('unevictable_memory', 'total_unevictable'),
+        'mlocked': ('unevictable_memory', 'mlocked_pages'),
+        'slab_unreclaimable': ('slab_memory', 'slab_unreclaimable'),
+        'page_tables': ('unevictable_memory', 'page_tables'),
+        'kernel_stack': ('unevictable_memory', 'kernel_stack'),
+    }
+
+    CGROUP_FIELDS = ('current', 'unevictable', 'slab', 'pressure_full_total')
+    NUMA_FIELDS = MetricStore.NUMA_FIELDS
+    # name -> rate key in the pressure section (per second)
+    RECLAIM_RATES = {'pgscan': 'pgscan', 'pgsteal': 'pgsteal', 'allocstall': 'allocstall',
+                     'compact_stall': 'compact_stall', 'some_stall_ms': 'some_stall_ms',
+                     'full_stall_ms': 'full_stall_ms'}
+
+    OVERHEAD_FIELDS = ('rss', 'cpu_ms', 'files_opened', 'read_syscalls', 'write_syscalls', 'read_bytes')
+
+    def __init__(self):
+        self.snapshots = 0
+        self.system = {name: RunningStats() for name in self.SYSTEM_METRICS}
+        self.memory_percent = RunningStats()
+        # Keyed by (pid, starttime) so a recycled PID starts a fresh series;
+        # names and cgroups are ids into `strings`
+        self.strings = InternTable()
+        self.processes: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.mlocked_processes: Dict[Tuple[int, int], Dict[str, Any]] = {}
+        self.latency = RunningStats()
+        self.start_lag = RunningStats()
+        # The investigator's own cost: per-collection totals and per section
+        self.overhead = {field: RunningStats() for field in self.OVERHEAD_FIELDS}
+        self.cpu_total = RunningStats()  # process CPU ms since start
+        self.section_overhead: Dict[str, Dict[str, RunningStats]] = {}
+        self.skipped_counts: Dict[str, int] = {}
+        self.bursts = set()  # PSI trigger firings seen
+        self.burst_snapshots = 0
+        self.psi = {kind: RunningStats() for kind in ('some', 'full')}  # avg10, percent
+        self.psi_full_total = RunningStats()  # cumulative stall microseconds
+        self.reclaim = {name: RunningStats() for name in self.RECLAIM_RATES}
+        # NUMA node -> {meminfo field: RunningStats}
+        self.numa: Dict[str, Dict[str, RunningStats]] = {}
+        # cgroup path -> {'current'|'unevictable'|'slab'|'pressure_full_total': RunningStats}
+        self.cgroups: Dict[str, Dict[str, RunningStats]] = {}
+        # Classified kernel log events: run totals and the most recent ones
+        self.kernel_events_available = False
+        self.kernel_event_counts = dict.fromkeys(KERNEL_EVENT_KINDS, 0)
+        self.kernel_events = deque(maxlen=50)
+        self.kernel_records_lost = 0
+        self.first_slab_caches: Optional[List[Dict[str, Any]]] = None
+        self.last_slab_caches: Optional[List[Dict[str, Any]]] = None
+
+    def update(self, snapshot: Dict[str, Any]):
+        """Fold one snapshot into the running statistics"""
+        t = datetime.fromisoformat(snapshot['timestamp']).timestamp()
+        # Burst samples weigh by the time they cover, so a burst does not
+        # pull means, EWMAs and slopes toward the pressure episode
+        w = snapshot_weight(snapshot)
+        self.snapshots += 1
+        # Carried-forward sections would add duplicate points and flatten slopes
+        for name, (section, field) in self.SYSTEM_METRICS.items():
+            if section_is_fresh(snapshot, section):
+                self.system[name].update(t, snapshot[section][field], w)
+        if section_is_fresh(snapshot, 'system_memory'):
+            self.memory_percent.update(t, snapshot['system_memory']['percent'], w)
+
+        collection = snapshot.get('collection', {})
+        if 'latency_ms' in collection:
+            self.latency.update(t, collection['latency_ms'])
+        for key in collection.get('skipped_sections', []):
+            self.skipped_counts[key] = self.skipped_counts.get(key, 0) + 1
+        own = collection.get('self')
+        if own:
+            for field, stats in self.overhead.items():
+                stats.update(t, own[field])
+            self.cpu_total.update(t, own['cpu_total_ms'])
+            for key, ms in collection['section_ms'].items():
+                entry = self.section_overhead.get(key)
+                if entry is None:
+                    entry = self.section_overhead[key] = {
+                        'ms': RunningStats(), 'cpu_ms': RunningStats(), 'opens': RunningStats()
+                    }
+                entry['ms'].update(t, ms)
+                entry['cpu_ms'].update(t, collection['section_cpu_ms'].get(key, 0))
+                entry['opens'].update(t, collection['section_opens'].get(key, 0))
+        tick = snapshot.get('tick', {})
+        if 'burst' in tick:
+            self.burst_snapshots += 1
+            self.bursts.add(tick['burst'])
+        elif 'start_lag_ms' in tick:
+            self.start_lag.update(t, tick['start_lag_ms'])
+
+        if snapshot.get('slab_caches') and section_is_fresh(snapshot, 'slab_caches'):
+            if self.first_slab_caches is None:
+                self.first_slab_caches = snapshot['slab_caches']
+            self.last_slab_caches = snapshot['slab_caches']
+
+        pressure = snapshot.get('pressure')
+        if pressure and pressure['available'] and section_is_fresh(snapshot, 'pressure'):
+            for kind, stats in self.psi.items():
+                stats.update(t, pressure[kind].get('avg10', 0.0), w)
+            self.psi_full_total.update(t, pressure['full'].get('total', 0), w)
+            for name, key in self.RECLAIM_RATES.items():
+                if key in pressure['rates']:
+                    self.reclaim[name].update(t, pressure['rates'][key], w)
+
+        kernel_events = snapshot.get('kernel_events')
+        if kernel_events and kernel_events['available'] and section_is_fresh(snapshot, 'kernel_events'):
+            self.kernel_events_available = True
+            for kind, count in kernel_events['new_counts'].items():
+                self.kernel_event_counts[kind] = self.kernel_event_counts.get(kind, 0) + count
+            self.kernel_events.extend(kernel_events['events'])
+            self.kernel_records_lost = kernel_events['records_lost']
+
+        numa = snapshot.get('numa')
+        if numa and section_is_fresh(snapshot, 'numa'):
+            for node, fields in numa.items():
+                entry = self.numa.setdefault(node, {field: RunningStats() for field in self.NUMA_FIELDS})
+                for field, stats in entry.items():
+                    stats.update(t, fields.get(field, 0), w)
+
+        cgroups = snapshot.get('cgroups')
+        if cgroups and section_is_fresh(snapshot, 'cgroups'):
+            for unit in cgroups['units']:
+                entry = self.cgroups.get(unit['path'])
+                if entry is None:
+                    entry = self.cgroups[unit['path']] = {
+                        field: RunningStats() for field in self.CGROUP_FIELDS
+                    }
+                for field, stats in entry.items():
+                    stats.update(t, unit[field], w)
+
+        if section_is_fresh(snapshot, 'processes'):
+            for proc in snapshot['processes']:
+                identity = _process_identity(proc)
+                entry = self.processes.get(identity)
+                if entry is None:
+                    entry = self.processes[identity] = {
+                        'name': self.strings.intern(proc['name']),
+                        'cgroup': self.strings.intern(proc.get('cgroup', '')),
+                        'rss': RunningStats(), 'percent': RunningStats()
+                    }
+                entry['rss'].update(t, proc['rss'], w)
+                entry['percent'].update(t, proc['memory_percent'], w)
+
+        unevictable = snapshot['unevictable_memory']
+        mlocked_at = unevictable.get('processes_with_mlocked_collected_at', snapshot['timestamp'])
+        if section_is_fresh(snapshot, 'unevictable_memory') and mlocked_at == snapshot['timestamp']:
+            for proc in unevictable['processes_with_mlocked']:
+                identity = _process_identity(proc)
+                entry = self.mlocked_processes.get(identity)
+                if entry is None:
+                    entry = self.mlocked_processes[identity] = {
+                        'name': self.strings.intern(proc['name']), 'mlocked': RunningStats()
+                    }
+                entry['mlocked'].update(t, proc['mlocked_kb'], w)
+
+    def cgroup_growth(self, min_samples: int = 2) -> List[Dict[str, Any]]:
+        """Units ranked by how much unevictable + slab memory they gained over the run"""
+        growth = []
+        for path, entry in self.cgroups.items():
+            if entry['current'].n < min_samples:
+                continue
+            growth.append({
+                'path': path,
+                'unevictable': entry['unevictable'].change,
+                'slab': entry['slab'].change,
+                'current': entry['current'].change,
+                'current_mb': entry['current'].last / (1024**2),
+                'current_mb_per_hour': entry['current'].slope * 3600 / (1024**2),
+                'stall_ms': entry['pressure_full_total'].change / 1000
+            })
+        return sorted(growth, key=lambda g: g['unevictable'] + g['slab'], reverse=True)
+
+    def leak_suspects(self, min_samples: int = 3, min_increase: float = 0.5) -> List[Dict[str, Any]]:
+        """Processes whose fitted memory share grew by more than `min_increase` points"""
+        suspects = []
+        for (pid, _), entry in self.processes.items():
+            percent = entry['percent']
+            if percent.n < min_samples:
+                continue
+            fitted_increase = percent.slope * percent.span
+            if fitted_increase > min_increase:
+                suspects.append({
+                    'pid': pid,
+                    'name': self.strings[entry['name']],
+                    'cgroup': self.strings[entry['cgroup']],
+                    'samples': percent.n,
+                    'increase': fitted_increase,
+                    'rss_mb_per_hour': entry['rss'].slope * 3600 / (1024**2),
+                    'rss_mb': entry['rss'].last / (1024**2)
+                })
+        return sorted(suspects, key=lambda x: x['rss_mb_per_hour'], reverse=True)
+
+    def format_suspects(self, limit: int = 10) -> str:
+        """Human-readable leak suspect list for the console or the report"""
+        suspects = self.leak_suspects()
+        if not suspects:
+            return "No processes with sustained memory growth\n"
+        lines = []
+        for suspect in suspects[:limit]:
+            lines.append(f"PID {suspect['pid']}: {suspect['name']} - "
+                         f"Memory increased by {suspect['increase']:.1f}% "
+                         f"({suspect['rss_mb_per_hour']:+.1f} MB/hour, "
+                         f"now {suspect['rss_mb']:.1f} MB, {suspect['samples']} samples)"
+                         f"{' in ' + suspect['cgroup'] if suspect['cgroup'] else ''}\n")
+        return ''.join(lines)
+
+
+class TickScheduler:
+    """Fixed-rate tick clock driven by absolute monotonic deadlines
+
+    Tick N is due at start + N * interval regardless of how long earlier
+    ticks took, so collection and save time never stretch the period. A tick
+    that overruns past one or more deadlines skips all but the most recent
+    (counted as missed) and starts that one immediately, instead of bursting
+    through every past-due tick to catch up.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.start = time.monotonic()
+        self.index = -1
+        self.missed = 0
+        self.overruns = 0
+
+    def deadline(self, index: int) -> float:
+        """Monotonic time tick `index` is due"""
+        return self.start + index * self.interval
+
+    def wait_next(self, end: float = None) -> Optional[Dict[str, Any]]:
+        """Sleep until the next due tick and describe it
+
+        Returns None without sleeping if that tick is due at or after the
+        monotonic time `end`.
+        """
+        target = self.index + 1
+        now = time.monotonic()
+        missed = 0
+        if self.index >= 0 and now > self.deadline(target):
+            # Previous tick ran past its budget; drop any whole periods it consumed
+            missed = int((now - self.deadline(target)) // self.interval)
+            target += missed
+            self.missed += missed
+            self.overruns += 1
+        if end is not None and self.deadline(target) >= end:
+            return None
+        delay = self.deadline(target) - now
+        if delay > 0:
+            time.sleep(delay)
+        self.index = target
+        started = time.monotonic()
+        return {
+            'index': target,
+            'scheduled_offset_s': round(target * self.interval, 3),
+            'start_lag_ms': round((started - self.deadline(target)) * 1000, 2),
+            'missed_before': missed,
+            'budget_deadline': self.deadline(target + 1)
+        }
+
+    def resync(self):
+        """Continue from the next future deadline after an off-schedule pause
+
+        Ticks that fell due during the pause (a PSI burst, which collected
+        more often than the schedule would have) are not counted as missed.
+        """
+        self.index = max(self.index, int((time.monotonic() - self.start) // self.interval))
+
+
+class PressureTrigger:
+    """Kernel PSI trigger on /proc/pressure/memory, waited on with poll()
+
+    The kernel raises POLLPRI once `stall_ms` of 'some' memory stall has
+    accumulated within `window_s` seconds, so the investigator can sleep in
+    poll() between ticks and still react to a spike within the window.
+    Without CAP_SYS_RESOURCE the window must be a multiple of 2 seconds.
+    """
+
+    def __init__(self, stall_ms: float, window_s: float = 2.0):
+        self.fd = os.open('/proc/pressure/memory', os.O_RDWR | os.O_NONBLOCK)
+        try:
+            os.write(self.fd, f"some {int(stall_ms * 1000)} {int(window_s * 1000000)}\0".encode())
+        except OSError:
+            os.close(self.fd)
+            raise
+        self.poller = select.poll()
+        self.poller.register(self.fd, select.POLLPRI)
+        self.fired = 0
+
+    def wait(self, timeout: float) -> bool:
+        """Block up to `timeout` seconds; True if the trigger fired"""
+        for _, events in self.poller.poll(max(0, int(timeout * 1000))):
+            if events & select.POLLERR:
+                raise OSError("PSI trigger was removed by the kernel")
+            if events & select.POLLPRI:
+                self.fired += 1
+                return True
+        return False
+
+    def close(self):
+        os.close(self.fd)
 
 
 class MemoryInvestigator:
-    def __init__(self, interval: int = 30, duration: int = 60):
+    # Snapshot sections in collection order:
+    # (key, collector, expensive, root only, needs the process table).
+    # Expensive sections are skipped on ticks whose budget they would blow.
+    SECTIONS = [
+        ('system_memory', '_get_system_memory', False, False, False),
+        ('processes', '_get_process_memory', False, False, True),
+        ('virtual_memory', '_get_virtual_memory', False, False, False),
+        ('swap_memory', '_get_swap_memory', False, False, False),
+        ('memory_maps', '_get_memory_maps', True, True, True),
+        ('kernel_memory', '_get_kernel_memory', False, False, False),
+        ('unevictable_memory', '_get_unevictable_memory', False, False, False),
+        ('shared_memory', '_get_shared_memory', False, False, False),
+        ('kernel_events', '_get_kernel_events', False, False, False),
+        ('memory_locks', '_get_memory_locks', True, True, True),
+        ('hugepages', '_get_hugepages_info', False, False, False),
+        ('slab_memory', '_get_slab_memory', False, False, False),
+        ('slab_caches', '_get_slab_caches', True, False, False),
+        ('cgroups', '_get_cgroup_memory', False, False, False),
+        ('pressure', '_get_memory_pressure', False, False, False),
+        ('numa', '_get_numa_memory', False, False, False),
+    ]
+    SECTION_KEYS = [section[0] for section in SECTIONS]
+    # An over-budget section is still collected after this many skipped ticks
+    MAX_BUDGET_SKIPS = 5
+    
+    def __init__(self, interval: int = 30, duration: int = 60, workers: int = 1,
+                 budget_skip: bool = True, cadences: Dict[str, float] = None,
+                 compression: str = 'none', keyframe_interval: int = 60,
+                 cgroup_depth: int = 3, psi_trigger_ms: float = None,
+                 psi_window: float = 2.0, burst_seconds: float = 10.0,
+                 burst_interval: float = 0.25):
         self.interval = interval
         self.duration = duration
+        self.pool = PidPool(workers)
+        self.cgroup_depth = cgroup_depth
+        # PSI trigger mode: sample everything every burst_interval for
+        # burst_seconds whenever the trigger fires
+        self.psi_trigger_ms = psi_trigger_ms
+        self.psi_window = psi_window
+        self.burst_seconds = burst_seconds
+        self.burst_interval = burst_interval
+        self._pressure_previous: Optional[Tuple[float, Dict[str, int]]] = None
+        self.budget_skip = budget_skip
+        # Collect each section every N ticks; sections not listed run every tick
+        self.cadence_ticks = {
+            key: max(1, round(seconds / interval)) for key, seconds in (cadences or {}).items()
+        }
+        self.section_cost: Dict[str, float] = {}  # EWMA of seconds per section
+        # Consecutive budget skips per section; a stale cost estimate from one
+        # slow sample must not keep a section skipped forever
+        self.skip_streak: Dict[str, int] = {}
+        self.last_collected: Dict[str, Tuple[Any, str]] = {}  # key -> (value, timestamp)
+        # Tick index each section was last collected on; cadence counts from
+        # here so a skipped or jumped-over tick delays it by ticks, not periods
+        self.collected_tick: Dict[str, int] = {}
+        self.scheduler_stats = {'missed': 0, 'overruns': 0}
         self.output_dir = Path(f"memory_investigation_{datetime.now().strftime('%Y%m%d_%H%M%S')}")
-        self.snapshots = []
+        self.compression = compression
+        self.keyframe_interval = keyframe_interval
+        self.log_path = self.output_dir / f"snapshots{LOG_SUFFIXES[compression]}"
+        self.log: Optional[SnapshotLog] = None
+        self.metrics: Optional[MetricStore] = None
+        # Only the newest snapshot stays in memory; history lives in the log
+        self.latest_snapshot: Optional[Dict[str, Any]] = None
+        self.snapshot_count = 0
+        self.analyzer = OnlineAnalyzer()
+        self.slab_tracker = SlabTracker()
+        self.kmsg = KmsgReader()
+        # Classified kernel log events seen this run, by kind
+        self.kernel_event_counts = dict.fromkeys(KERNEL_EVENT_KINDS, 0)
+        self.suspects_requested = False
+        self.terminated = False
         
     def setup_output_dir(self):
         """Create output directory structure"""
         self.output_dir.mkdir(exist_ok=True)
-        (self.output_dir / "snapshots").mkdir(exist_ok=True)
+        self.log = SnapshotLog(self.log_path, self.compression,
+                               keyframe_interval=self.keyframe_interval)
+        # Flush about once a minute of wall time whatever the interval
+        self.metrics = MetricStore(self.output_dir / "metrics",
+                                   flush_rows=max(1, round(60 / self.interval)))
         print(f"Created output directory: {self.output_dir}")
         
-    def collect_system_snapshot(self) -> Dict[str, Any]:
-        """Collect comprehensive system memory snapshot"""
-        timestamp = datetime.now()
+    def load_log(self, path: Path):
+        """Point the investigator at an existing log so its report can be rebuilt"""
+        self.log_path = Path(path)
+        self.output_dir = self.log_path.parent
+        for snapshot in iter_snapshots(self.log_path):
+            self.latest_snapshot = snapshot
+            self.snapshot_count += 1
+            self.analyzer.update(snapshot)
+            missed = snapshot.get('tick', {}).get('missed_before', 0)
+            if missed:
+                self.scheduler_stats['missed'] += missed
+                self.scheduler_stats['overruns'] += 1
+        tick = (self.latest_snapshot or {}).get('tick')
+        if tick and tick['index'] > 0:
+            # Report the run's own timing rather than this invocation's
+            # defaults, as ints when whole so the text matches the live report
+            interval = round(tick['scheduled_offset_s'] / tick['index'], 3)
+            duration = round((tick['scheduled_offset_s'] + interval) / 60, 1)
+            self.interval = int(interval) if interval.is_integer() else interval
+            self.duration = int(duration) if duration.is_integer() else duration
+        
+    def collect_system_snapshot(self, deadline: float = None, tick_index: int = None) -> Dict[str, Any]:
+        """Collect comprehensive system memory snapshot
+
+        Sections collected fewer than their cadence's ticks before
+        `tick_index` are carried forward from their last collection instead
+        of being re-read; a section whose due tick was skipped is collected
+        on the next tick it gets. If a monotonic `deadline` is given,
+        expensive sections whose recent cost would push collection past it
+        are carried forward as well, for at most MAX_BUDGET_SKIPS ticks in a
+        row. The 'sections' entry marks each section as fresh or carried
+        forward. The 'collection' entry records what collecting cost: wall
+        and CPU time and files opened per section, plus the investigator's
+        own RSS and syscall counts.
+        """
+        usage_before = read_self_usage()
+        started = time.perf_counter_ns()
+        is_root = os.geteuid() == 0
+        due = {
+            key for key in self.SECTION_KEYS
+            if tick_index is None or key not in self.collected_tick
+            or tick_index - self.collected_tick[key] >= self.cadence_ticks.get(key, 1)
+        }
+        needs_processes = any(
+            walk and key in due and (is_root or not root_only)
+            for key, _, _, root_only, walk in self.SECTIONS
+        )
+        procfs = ProcfsSnapshot.read(self.pool, processes=needs_processes)
+        timestamp = procfs.timestamp
         
         print(f"[{timestamp.strftime('%H:%M:%S')}] Collecting system snapshot...")
         
-        snapshot = {
-            'timestamp': timestamp.isoformat(),
-            'system_memory': self._get_system_memory(),
-            'processes': self._get_process_memory(),
-            'virtual_memory': self._get_virtual_memory(),
-            'swap_memory': self._get_swap_memory(),
-            'memory_maps': self._get_memory_maps() if os.geteuid() == 0 else None,
-            'kernel_memory': self._get_kernel_memory(),
-            'unevictable_memory': self._get_unevictable_memory(),
-            'shared_memory': self._get_shared_memory(),
-            'memory_locks': self._get_memory_locks() if os.geteuid() == 0 else None,
-            'hugepages': self._get_hugepages_info(),
-            'slab_memory': self._get_slab_memory()
-        }
+        snapshot = {'timestamp': timestamp.isoformat()}
+        section_ms = {'procfs_read': round((time.perf_counter_ns() - started) / 1e6, 2)}
+        section_cpu_ms = {'procfs_read': round((time.process_time_ns() - usage_before['cpu_ns']) / 1e6, 2)}
+        section_opens = {'procfs_read': files_opened() - usage_before['files_opened']}
+        sections = {}
+        skipped = []
+        for key, method, expensive, root_only, _ in self.SECTIONS:
+            if root_only and not is_root:
+                snapshot[key] = None
+                continue
+            over_budget = (expensive and deadline is not None and self.budget_skip
+                           and self.skip_streak.get(key, 0) < self.MAX_BUDGET_SKIPS
+                           and time.monotonic() + self.section_cost.get(key, 0) > deadline)
+            if key not in due or over_budget:
+                if over_budget and key in due:
+                    skipped.append(key)
+                    self.skip_streak[key] = self.skip_streak.get(key, 0) + 1
+                value, collected_at = self.last_collected.get(key, (None, None))
+                snapshot[key] = value
+                sections[key] = {'fresh': False, 'collected_at': collected_at}
+                continue
+            self.skip_streak.pop(key, None)
+            opens_start = files_opened()
+            cpu_start = time.process_time_ns()
+            section_start = time.perf_counter_ns()
+            snapshot[key] = getattr(self, method)(procfs)
+            cost = (time.perf_counter_ns() - section_start) / 1e9
+            section_cpu_ms[key] = round((time.process_time_ns() - cpu_start) / 1e6, 2)
+            section_opens[key] = files_opened() - opens_start
+            previous = self.section_cost.get(key)
+            self.section_cost[key] = cost if previous is None else 0.7 * previous + 0.3 * cost
+            section_ms[key] = round(cost * 1000, 2)
+            self.last_collected[key] = (snapshot[key], snapshot['timestamp'])
+            if tick_index is not None:
+                self.collected_tick[key] = tick_index
+            sections[key] = {'fresh': True, 'collected_at': snapshot['timestamp']}
         
+        snapshot['sections'] = sections
+        latency_ms = round((time.perf_counter_ns() - started) / 1e6, 2)
+        usage = read_self_usage()
+        snapshot['collection'] = {
+            'latency_ms': latency_ms,
+            'section_ms': section_ms,
+            'section_cpu_ms': section_cpu_ms,
+            'section_opens': section_opens,
+            'skipped_sections': skipped,
+            # The investigator itself; deltas cover this collection only,
+            # cpu_total_ms everything the process has done since it started
+            'self': {
+                'rss': usage['rss'],
+                'peak_rss': usage['peak_rss'],
+                'cpu_ms': round((usage['cpu_ns'] - usage_before['cpu_ns']) / 1e6, 2),
+                'cpu_total_ms': round(usage['cpu_ns'] / 1e6, 2),
+                'files_opened': usage['files_opened'] - usage_before['files_opened'],
+                'read_syscalls': usage['read_syscalls'] - usage_before['read_syscalls'],
+                'write_syscalls': usage['write_syscalls'] - usage_before['write_syscalls'],
+                'read_bytes': usage['read_bytes'] - usage_before['read_bytes']
+            }
+        }
         return snapshot
         
-    def _get_system_memory(self) -> Dict[str, Any]:
-        """Get system-wide memory information"""
-        mem = psutil.virtual_memory()
+    def _get_system_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
+        """Get system-wide memory information (same accounting as psutil.virtual_memory)"""
+        total = procfs.meminfo_bytes('MemTotal')
+        free = procfs.meminfo_bytes('MemFree')
+        buffers = procfs.meminfo_bytes('Buffers')
+        cached = procfs.meminfo_bytes('Cached') + procfs.meminfo_bytes('SReclaimable')
+        available = procfs.meminfo_bytes('MemAvailable') if 'MemAvailable' in procfs.meminfo else free + cached
+        used = total - available
         return {
-            'total': mem.total,
-            'available': mem.available,
-            'used': mem.used,
-            'free': mem.free,
-            'percent': mem.percent,
-            'active': mem.active,
-            'inactive': mem.inactive,
-            'buffers': getattr(mem, 'buffers', 0),
-            'cached': getattr(mem, 'cached', 0),
-            'shared': getattr(mem, 'shared', 0)
+            'total': total,
+            'available': available,
+            'used': used,
+            'free': free,
+            'percent': round(used / total * 100, 1) if total else 0.0,
+            'active': procfs.meminfo_bytes('Active'),
+            'inactive': procfs.meminfo_bytes('Inactive'),
+            'buffers': buffers,
+            'cached': cached,
+            'shared': procfs.meminfo_bytes('Shmem')
         }
         
-    def _get_process_memory(self) -> List[Dict[str, Any]]:
+    def _get_process_memory(self, procfs: ProcfsSnapshot) -> List[Dict[str, Any]]:
         """Get memory usage for all processes, sorted by memory usage"""
-        processes = []
+        total = procfs.meminfo_bytes('MemTotal') or 1
+        top = sorted(procfs.processes, key=lambda p: p.rss, reverse=True)[:50]
         
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info', 'memory_percent', 'cmdline']):
-            try:
-                pinfo = proc.info
-                mem_info = pinfo['memory_info']
-                processes.append({
-                    'pid': pinfo['pid'],
-                    'name': pinfo['name'],
-                    'cmdline': ' '.join(pinfo['cmdline'][:3]) if pinfo['cmdline'] else '',
-                    'memory_percent': round(pinfo['memory_percent'], 2),
-                    'rss': mem_info.rss,  # Resident Set Size
-                    'vms': mem_info.vms,  # Virtual Memory Size
-                    'shared': getattr(mem_info, 'shared', 0),
-                    'text': getattr(mem_info, 'text', 0),
-                    'data': getattr(mem_info, 'data', 0)
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-                
-        # Sort by memory percentage (descending)
-        return sorted(processes, key=lambda x: x['memory_percent'], reverse=True)[:50]
+        return [{
+            'pid': proc.pid,
+            'starttime': proc.starttime(),
+            'name': proc.name,
+            'cmdline': proc.cmdline(),
+            'cgroup': proc.cgroup(),
+            'memory_percent': round(proc.rss / total * 100, 2),
+            'rss': proc.rss,  # Resident Set Size
+            'vms': proc.vms,  # Virtual Memory Size
+            'shared': proc.shared,
+            'text': proc.text,
+            'data': proc.data,
+            'vmlck': proc.vmlck
+        } for proc in top]
         
-    def _get_virtual_memory(self) -> Dict[str, Any]:
+    def _get_virtual_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get virtual memory statistics"""
-        try:
-            with open('/proc/vmstat', 'r') as f:
-                vmstat = {}
-                for line in f:
-                    key, value = line.strip().split()
-                    vmstat[key] = int(value)
-                return vmstat
-        except:
-            return {}
+        return dict(procfs.vmstat)
             
-    def _get_swap_memory(self) -> Dict[str, Any]:
+    def _get_swap_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get swap memory information"""
-        swap = psutil.swap_memory()
+        total = procfs.meminfo_bytes('SwapTotal')
+        free = procfs.meminfo_bytes('SwapFree')
+        used = total - free
         return {
-            'total': swap.total,
-            'used': swap.used,
-            'free': swap.free,
-            'percent': swap.percent
+            'total': total,
+            'used': used,
+            'free': free,
+            'percent': round(used / total * 100, 1) if total else 0.0
         }
         
-    def _get_memory_maps(self) -> List[Dict[str, Any]]:
+    def _get_memory_maps(self, procfs: ProcfsSnapshot) -> List[Dict[str, Any]]:
         """Get memory maps for top memory consuming processes (requires root)"""
         if os.geteuid() != 0:
             return []
             
-        memory_maps = []
-        processes = sorted(psutil.process_iter(['pid', 'memory_percent']), 
-                         key=lambda x: x.info['memory_percent'], reverse=True)[:5]
+        top = sorted(procfs.processes, key=lambda p: p.rss, reverse=True)[:5]
+        return self.pool.map(self._read_memory_maps, [p.pid for p in top])
         
-        for proc in processes:
-            try:
-                pid = proc.info['pid']
-                maps = []
-                for mmap in proc.memory_maps():
-                    maps.append({
-                        'path': mmap.path,
-                        'rss': mmap.rss,
-                        'size': mmap.size,
-                        'pss': getattr(mmap, 'pss', 0),
-                        'shared_clean': getattr(mmap, 'shared_clean', 0),
-                        'shared_dirty': getattr(mmap, 'shared_dirty', 0)
-                    })
-                memory_maps.append({
-                    'pid': pid,
-                    'maps': maps
-                })
-            except (psutil.NoSuchProcess, psutil.AccessDenied):
-                continue
-                
-        return memory_maps
+    @staticmethod
+    def _read_memory_maps(pid: int) -> Dict[str, Any]:
+        """Read the per-mapping breakdown of one process"""
+        _count_open()  # psutil reads /proc/PID/smaps
+        try:
+            mmaps = psutil.Process(pid).memory_maps()
+        except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+            raise OSError(str(e))
+        return {
+            'pid': pid,
+            'maps': [{
+                'path': mmap.path,
+                'rss': mmap.rss,
+                'size': mmap.size,
+                'pss': getattr(mmap, 'pss', 0),
+                'shared_clean': getattr(mmap, 'shared_clean', 0),
+                'shared_dirty': getattr(mmap, 'shared_dirty', 0)
+            } for mmap in mmaps]
+        }
         
-    def _get_kernel_memory(self) -> Dict[str, Any]:
+    def _get_kernel_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get kernel memory usage from /proc/meminfo"""
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                meminfo = {}
-                for line in f:
-                    key, value = line.split(':')
-                    value = value.strip().split()[0]
-                    meminfo[key] = int(value) * 1024 if value.isdigit() else value
-                return meminfo
-        except:
-            return {}
+        return {key: value * 1024 for key, value in procfs.meminfo.items()}
             
-    def _get_unevictable_memory(self) -> Dict[str, Any]:
+    def _get_unevictable_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get detailed unevictable memory information"""
         unevictable_info = {
-            'total_unevictable': 0,
-            'mlocked_pages': 0,
-            'kernel_stack': 0,
-            'page_tables': 0,
-            'nfs_unstable': 0,
-            'bounce': 0,
-            'writeback_tmp': 0,
+            'total_unevictable': procfs.meminfo_bytes('Unevictable'),
+            'mlocked_pages': procfs.meminfo_bytes('Mlocked'),
+            'kernel_stack': procfs.meminfo_bytes('KernelStack'),
+            'page_tables': procfs.meminfo_bytes('PageTables'),
+            'nfs_unstable': procfs.meminfo_bytes('NFS_Unstable'),
+            'bounce': procfs.meminfo_bytes('Bounce'),
+            'writeback_tmp': procfs.meminfo_bytes('WritebackTmp'),
             'processes_with_mlocked': [],
+            # When the list was read; older than the snapshot when carried forward
+            'processes_with_mlocked_collected_at': procfs.timestamp.isoformat(),
             'unevictable_breakdown': {}
         }
-        
-        # Get basic unevictable info from /proc/meminfo
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                for line in f:
-                    if line.startswith('Unevictable:'):
-                        unevictable_info['total_unevictable'] = int(line.split()[1]) * 1024
-                    elif line.startswith('Mlocked:'):
-                        unevictable_info['mlocked_pages'] = int(line.split()[1]) * 1024
-                    elif line.startswith('KernelStack:'):
-                        unevictable_info['kernel_stack'] = int(line.split()[1]) * 1024
-                    elif line.startswith('PageTables:'):
-                        unevictable_info['page_tables'] = int(line.split()[1]) * 1024
-                    elif line.startswith('NFS_Unstable:'):
-                        unevictable_info['nfs_unstable'] = int(line.split()[1]) * 1024
-                    elif line.startswith('Bounce:'):
-                        unevictable_info['bounce'] = int(line.split()[1]) * 1024
-                    elif line.startswith('WritebackTmp:'):
-                        unevictable_info['writeback_tmp'] = int(line.split()[1]) * 1024
-        except:
-            pass
             
-        # Find processes with mlocked memory
-        for proc in psutil.process_iter(['pid', 'name', 'memory_info']):
-            try:
-                pid = proc.info['pid']
-                # Check for mlocked memory in process status
-                status_file = f'/proc/{pid}/status'
-                if os.path.exists(status_file):
-                    with open(status_file, 'r') as f:
-                        for line in f:
-                            if line.startswith('VmLck:'):
-                                mlocked_kb = int(line.split()[1])
-                                if mlocked_kb > 0:
-                                    unevictable_info['processes_with_mlocked'].append({
-                                        'pid': pid,
-                                        'name': proc.info['name'],
-                                        'mlocked_kb': mlocked_kb * 1024
-                                    })
-                                break
-            except (psutil.NoSuchProcess, psutil.AccessDenied, FileNotFoundError, ValueError):
-                continue
+        # Find processes with mlocked memory; between process-table ticks
+        # reuse the list from the last walk
+        if procfs.processes is None:
+            previous, _ = self.last_collected.get('unevictable_memory', (None, None))
+            if previous:
+                unevictable_info['processes_with_mlocked'] = previous['processes_with_mlocked']
+                unevictable_info['processes_with_mlocked_collected_at'] = previous.get(
+                    'processes_with_mlocked_collected_at')
+        else:
+            for proc in procfs.processes:
+                if proc.vmlck > 0:
+                    unevictable_info['processes_with_mlocked'].append({
+                        'pid': proc.pid,
+                        'starttime': proc.starttime(),
+                        'name': proc.name,
+                        'mlocked_kb': proc.vmlck
+                    })
                 
+
         # Get zone information for unevictable pages
-        try:
-            with open('/proc/zoneinfo', 'r') as f:
-                current_zone = None
-                zone_data = {}
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('Node') and 'zone' in line:
-                        current_zone = line.split()[-1]
-                        zone_data[current_zone] = {}
-                    elif current_zone and 'nr_unevictable' in line:
-                        pages = int(line.split()[1])
-                        zone_data[current_zone]['unevictable_pages'] = pages * 4096  # Assume 4KB pages
-                        
-                unevictable_info['unevictable_breakdown'] = zone_data
-        except:
-            pass
+        unevictable_info['unevictable_breakdown'] = read_zoneinfo()
             
         return unevictable_info
         
-    def _get_shared_memory(self) -> Dict[str, Any]:
+    def _get_shared_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get shared memory information"""
         shared_info = {
-            'shmem_total': 0,
+            'shmem_total': procfs.meminfo_bytes('Shmem'),
             'tmpfs_usage': [],
             'shm_segments': [],
             'posix_shm': [],
             'sysv_shm': []
         }
-        
-        # Get shared memory from /proc/meminfo
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                for line in f:
-                    if line.startswith('Shmem:'):
-                        shared_info['shmem_total'] = int(line.split()[1]) * 1024
-                        break
-        except:
-            pass
-            
-        # Get tmpfs mount usage
-        try:
-            result = subprocess.run(['df', '-h', '-t', 'tmpfs'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[1:]  # Skip header
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        shared_info['tmpfs_usage'].append({
-                            'filesystem': parts[0],
-                            'size': parts[1],
-                            'used': parts[2],
-                            'available': parts[3],
-                            'use_percent': parts[4],
-                            'mountpoint': parts[5]
-                        })
-        except:
-            pass
-            
-        # Get shared memory segments using ipcs
-        try:
-            # POSIX shared memory
-            result = subprocess.run(['ls', '-la', '/dev/shm/'], 
-                                  capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n')[1:]:  # Skip total line
-                    if line.strip() and not line.startswith('total'):
-                        parts = line.split()
-                        if len(parts) >= 9:
-                            shared_info['posix_shm'].append({
-                                'name': parts[-1],
-                                'size': parts[4],
-                                'permissions': parts[0],
-                                'owner': parts[2]
-                            })
-        except:
-            pass
             
-        # Get System V shared memory segments
-        try:
-            result = subprocess.run(['ipcs', '-m'], capture_output=True, text=True)
-            if result.returncode == 0:
-                lines = result.stdout.split('\n')
-                in_data_section = False
-                for line in lines:
-                    if 'shmid' in line.lower() and 'owner' in line.lower():
-                        in_data_section = True
-                        continue
-                    if in_data_section and line.strip():
-                        parts = line.split()
-                        if len(parts) >= 6:
-                            shared_info['sysv_shm'].append({
-                                'shmid': parts[0],
-                                'owner': parts[1],
-                                'perms': parts[2],
-                                'bytes': int(parts[3]) if parts[3].isdigit() else parts[3],
-                                'nattch': parts[4],
-                                'status': parts[5] if len(parts) > 5 else ''
-                            })
-        except:
-            pass
+        shared_info['tmpfs_usage'] = read_tmpfs_usage()
+        shared_info['posix_shm'] = read_posix_shm()
+        shared_info['sysv_shm'] = read_sysv_shm()
             
         return shared_info
         
-    def _get_memory_locks(self) -> Dict[str, Any]:
+    def _get_memory_locks(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get information about memory locks (requires root)"""
         if os.geteuid() != 0:
             return {}
@@ -328,163 +2063,181 @@ class MemoryInvestigator:
         lock_info = {
             'total_locked_pages': 0,
             'processes_with_locks': [],
-            'mlock_failures': 0
+            # mlock failures logged by the kernel so far this run (see kernel_events)
+            'mlock_failures': self.kernel_event_counts['mlock']
         }
-        
-        # Check dmesg for mlock-related messages
-        try:
-            result = subprocess.run(['dmesg'], capture_output=True, text=True)
-            if result.returncode == 0:
-                mlock_failures = len([line for line in result.stdout.split('\n') 
-                                    if 'mlock' in line.lower() and 'fail' in line.lower()])
-                lock_info['mlock_failures'] = mlock_failures
-        except:
-            pass
             
-        # Get detailed lock information from each process
+        # Get per-process Pss/Swap/Locked totals, rollup-first
         total_locked = 0
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                pid = proc.info['pid']
-                smaps_file = f'/proc/{pid}/smaps'
-                if os.path.exists(smaps_file):
-                    process_locked = 0
-                    with open(smaps_file, 'r') as f:
-                        for line in f:
-                            if line.startswith('Locked:'):
-                                locked_kb = int(line.split()[1])
-                                process_locked += locked_kb * 1024
-                                
-                    if process_locked > 0:
-                        lock_info['processes_with_locks'].append({
-                            'pid': pid,
-                            'name': proc.info['name'],
-                            'locked_bytes': process_locked
-                        })
-                        total_locked += process_locked
-            except (psutil.NoSuchProcess, psutil.AccessDenied, FileNotFoundError, ValueError):
-                continue
+        smaps_totals = []
+        sources = {'smaps_rollup': 0, 'smaps': 0}
+        started = time.perf_counter()
+        names = {proc.pid: proc.name for proc in procfs.processes}
+        results = self.pool.map(lambda pid: (pid, read_smaps_totals(pid)), list(names))
+        for pid, (totals, source) in results:
+            sources[source] += 1
+            smaps_totals.append({
+                'pid': pid,
+                'name': names[pid],
+                'pss': totals['Pss'],
+                'swap': totals['Swap'],
+                'swap_pss': totals['SwapPss'],
+                'locked': totals['Locked']
+            })
+            if totals['Locked'] > 0:
+                lock_info['processes_with_locks'].append({
+                    'pid': pid,
+                    'name': names[pid],
+                    'locked_bytes': totals['Locked']
+                })
+                total_locked += totals['Locked']
                 
+        smaps_totals.sort(key=lambda x: x['pss'], reverse=True)
+        lock_info['process_smaps_totals'] = smaps_totals[:50]
+        lock_info['pss_total'] = sum(p['pss'] for p in smaps_totals)
+        lock_info['swap_total'] = sum(p['swap'] for p in smaps_totals)
+        lock_info['smaps_sources'] = sources
+        lock_info['smaps_collection_ms'] = round((time.perf_counter() - started) * 1000, 2)
         lock_info['total_locked_pages'] = total_locked
         return lock_info
         
-    def _get_hugepages_info(self) -> Dict[str, Any]:
+    def _get_kernel_events(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
+        """Get memory-related kernel log events logged since the last read"""
+        events_info = {
+            'available': True,
+            'events': [],
+            'new_counts': dict.fromkeys(KERNEL_EVENT_KINDS, 0),
+            'counts': dict(self.kernel_event_counts),
+            'records_read': 0,
+            'records_lost': self.kmsg.lost
+        }
+        try:
+            records = self.kmsg.read_new()
+        except OSError:
+            events_info['available'] = False  # no /dev/kmsg access (container, dmesg_restrict)
+            return events_info
+        
+        # Kernel timestamps are monotonic microseconds; map them to wall time now
+        wall_offset = time.time() - time.monotonic()
+        for record in records:
+            kind = classify_kernel_message(record['message'])
+            if kind is None:
+                continue
+            self.kernel_event_counts[kind] += 1
+            events_info['new_counts'][kind] += 1
+            events_info['events'].append({
+                'seq': record['seq'],
+                'time': datetime.fromtimestamp(wall_offset + record['usec'] / 1e6).isoformat(),
+                'kind': kind,
+                'priority': record['priority'],
+                'message': record['message'][:200]
+            })
+        # Keep a flood (an OOM storm) from bloating the snapshot; counts stay exact
+        events_info['events'] = events_info['events'][-100:]
+        events_info['counts'] = dict(self.kernel_event_counts)
+        events_info['records_read'] = len(records)
+        events_info['records_lost'] = self.kmsg.lost
+        return events_info
+        
+    def _get_hugepages_info(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
         """Get hugepages information"""
         hugepages_info = {
-            'hugepages_total': 0,
-            'hugepages_free': 0,
-            'hugepages_reserved': 0,
-            'hugepages_surplus': 0,
-            'hugepagesize': 0,
+            'hugepages_total': procfs.meminfo.get('HugePages_Total', 0),
+            'hugepages_free': procfs.meminfo.get('HugePages_Free', 0),
+            'hugepages_reserved': procfs.meminfo.get('HugePages_Rsvd', 0),
+            'hugepages_surplus': procfs.meminfo.get('HugePages_Surp', 0),
+            'hugepagesize': procfs.meminfo_bytes('Hugepagesize'),
             'transparent_hugepages': {},
             'hugepage_usage': []
         }
-        
-        # Get hugepage info from /proc/meminfo
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                for line in f:
-                    if line.startswith('HugePages_Total:'):
-                        hugepages_info['hugepages_total'] = int(line.split()[1])
-                    elif line.startswith('HugePages_Free:'):
-                        hugepages_info['hugepages_free'] = int(line.split()[1])
-                    elif line.startswith('HugePages_Rsvd:'):
-                        hugepages_info['hugepages_reserved'] = int(line.split()[1])
-                    elif line.startswith('HugePages_Surp:'):
-                        hugepages_info['hugepages_surplus'] = int(line.split()[1])
-                    elif line.startswith('Hugepagesize:'):
-                        hugepages_info['hugepagesize'] = int(line.split()[1]) * 1024
-        except:
-            pass
             
         # Get transparent hugepage info
         try:
+            _count_open()
             with open('/sys/kernel/mm/transparent_hugepage/enabled', 'r') as f:
                 hugepages_info['transparent_hugepages']['enabled'] = f.read().strip()
         except:
             hugepages_info['transparent_hugepages']['enabled'] = 'unknown'
             
-        try:
-            with open('/proc/vmstat', 'r') as f:
-                thp_stats = {}
-                for line in f:
-                    if line.startswith('thp_'):
-                        key, value = line.split()
-                        thp_stats[key] = int(value)
-                hugepages_info['transparent_hugepages']['stats'] = thp_stats
-        except:
-            pass
+        hugepages_info['transparent_hugepages']['stats'] = {
+            key: value for key, value in procfs.vmstat.items() if key.startswith('thp_')
+        }
             
         return hugepages_info
         
-    def _get_slab_memory(self) -> Dict[str, Any]:
-        """Get slab allocator memory information"""
-        slab_info = {
-            'total_slab': 0,
-            'slab_reclaimable': 0,
-            'slab_unreclaimable': 0,
-            'top_slab_caches': []
+    def _get_slab_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
+        """Get slab allocator totals from /proc/meminfo"""
+        return {
+            'total_slab': procfs.meminfo_bytes('Slab'),
+            'slab_reclaimable': procfs.meminfo_bytes('SReclaimable'),
+            'slab_unreclaimable': procfs.meminfo_bytes('SUnreclaim')
         }
         
-        # Get slab totals from /proc/meminfo
-        try:
-            with open('/proc/meminfo', 'r') as f:
-                for line in f:
-                    if line.startswith('Slab:'):
-                        slab_info['total_slab'] = int(line.split()[1]) * 1024
-                    elif line.startswith('SReclaimable:'):
-                        slab_info['slab_reclaimable'] = int(line.split()[1]) * 1024
-                    elif line.startswith('SUnreclaim:'):
-                        slab_info['slab_unreclaimable'] = int(line.split()[1]) * 1024
-        except:
-            pass
-            
-        # Get detailed slab cache info
-        try:
-            with open('/proc/slabinfo', 'r') as f:
-                lines = f.readlines()[2:]  # Skip header lines
-                slab_caches = []
-                
-                for line in lines:
-                    parts = line.split()
-                    if len(parts) >= 6:
-                        cache_name = parts[0]
-                        active_objs = int(parts[1])
-                        num_objs = int(parts[2])
-                        objsize = int(parts[3])
-                        active_slabs = int(parts[4])
-                        num_slabs = int(parts[5])
-                        
-                        total_size = num_objs * objsize
-                        slab_caches.append({
-                            'name': cache_name,
-                            'active_objects': active_objs,
-                            'total_objects': num_objs,
-                            'object_size': objsize,
-                            'active_slabs': active_slabs,
-                            'total_slabs': num_slabs,
-                            'total_size': total_size
-                        })
-                        
-                # Sort by total size and take top 20
-                slab_caches.sort(key=lambda x: x['total_size'], reverse=True)
-                slab_info['top_slab_caches'] = slab_caches[:20]
-        except:
-            pass
-            
-        return slab_info
+    def _get_slab_caches(self, procfs: ProcfsSnapshot) -> List[Dict[str, Any]]:
+        """Get the largest and the fastest-growing slab caches"""
+        caches, _ = read_slab_caches()
+        if not caches:
+            return []
+        self.slab_tracker.update(caches, time.time())
+        return self.slab_tracker.entries()
             
-    def save_snapshot(self, snapshot: Dict[str, Any]):
-        """Save snapshot to file"""
-        timestamp_str = datetime.fromisoformat(snapshot['timestamp']).strftime('%Y%m%d_%H%M%S')
-        snapshot_file = self.output_dir / "snapshots" / f"snapshot_{timestamp_str}.json"
+    def _get_cgroup_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
+        """Get per-unit memory accounting from the cgroup v2 hierarchy"""
+        units = read_cgroup_memory(CGROUP_ROOT, self.cgroup_depth)
+        return {
+            'hierarchy': 'v2' if units is not None else None,
+            'units': units or []
+        }
         
-        with open(snapshot_file, 'w') as f:
-            json.dump(snapshot, f, indent=2)
-            
-        # Also save human-readable summary
-        summary_file = self.output_dir / "snapshots" / f"summary_{timestamp_str}.txt"
-        self._save_human_readable_summary(snapshot, summary_file)
+    def _get_numa_memory(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
+        """Get per-NUMA-node memory from /sys/devices/system/node"""
+        return read_numa_nodes()
+        
+    def _get_memory_pressure(self, procfs: ProcfsSnapshot) -> Dict[str, Any]:
+        """Get memory PSI and reclaim activity as rates since the previous collection"""
+        pressure = parse_pressure(_read_proc_text('/proc/pressure/memory'))
+        totals = reclaim_counters(procfs.vmstat)
+        for kind in ('some', 'full'):
+            totals[f'{kind}_stall_us'] = pressure.get(kind, {}).get('total', 0)
+        now = time.monotonic()
+        
+        pressure_info = {
+            'available': bool(pressure),
+            'some': pressure.get('some', {}),
+            'full': pressure.get('full', {}),
+            'interval_s': None,
+            'rates': {}
+        }
+        if self._pressure_previous is not None:
+            then, previous = self._pressure_previous
+            elapsed = now - then
+            if elapsed > 0:
+                pressure_info['interval_s'] = round(elapsed, 3)
+                # per second; *_stall_us becomes stalled ms per second of wall time
+                rates = {key: (value - previous.get(key, 0)) / elapsed for key, value in totals.items()}
+                for kind in ('some', 'full'):
+                    rates[f'{kind}_stall_ms'] = rates.pop(f'{kind}_stall_us') / 1000
+                rates['reclaim_efficiency'] = (rates['pgsteal'] / rates['pgscan']
+                                               if rates['pgscan'] > 0 else None)
+                pressure_info['rates'] = {key: round(value, 3) if value is not None else None
+                                          for key, value in rates.items()}
+        self._pressure_previous = (now, totals)
+        return pressure_info
+        
+    def save_snapshot(self, snapshot: Dict[str, Any]):
+        """Append snapshot to the log and refresh the latest summary"""
+        # Hold SIGTERM until both stores have taken the whole snapshot, so
+        # the shutdown path never flushes a half-appended row
+        signal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGTERM})
+        try:
+            self.log.append(snapshot)
+            self.metrics.append(snapshot)
+        finally:
+            signal.pthread_sigmask(signal.SIG_UNBLOCK, {signal.SIGTERM})
+        self.analyzer.update(snapshot)
+        self.latest_snapshot = snapshot
+        self.snapshot_count += 1
+        self._save_human_readable_summary(snapshot, self.output_dir / "latest_summary.txt")
         
     def _save_human_readable_summary(self, snapshot: Dict[str, Any], filepath: Path):
         """Save human-readable summary of snapshot"""
@@ -518,6 +2271,21 @@ class MemoryInvestigator:
                            f"{proc['mlocked_kb'] / (1024**2):.1f} MB\n")
             f.write("\n")
             
+            # Per-process Pss/Swap/Locked from smaps_rollup (root only)
+            locks = snapshot.get('memory_locks')
+            if locks and locks.get('process_smaps_totals'):
+                f.write("TOP PROCESSES BY PSS:\n")
+                f.write("-" * 40 + "\n")
+                f.write(f"Total Pss: {locks['pss_total'] / (1024**2):.1f} MB, "
+                       f"Total Swap: {locks['swap_total'] / (1024**2):.1f} MB "
+                       f"(collected in {locks['smaps_collection_ms']:.1f} ms)\n")
+                for proc in locks['process_smaps_totals'][:5]:
+                    f.write(f"  PID {proc['pid']} ({proc['name']}): "
+                           f"Pss={proc['pss'] / (1024**2):.1f} MB, "
+                           f"Swap={proc['swap'] / (1024**2):.1f} MB, "
+                           f"Locked={proc['locked'] / (1024**2):.1f} MB\n")
+                f.write("\n")
+            
             # Shared Memory Analysis  
             shared = snapshot['shared_memory']
             f.write("SHARED MEMORY ANALYSIS:\n")
@@ -527,8 +2295,8 @@ class MemoryInvestigator:
             if shared['tmpfs_usage']:
                 f.write("tmpfs Usage:\n")
                 for tmpfs in shared['tmpfs_usage']:
-                    f.write(f"  {tmpfs['mountpoint']}: {tmpfs['used']} / {tmpfs['size']} "
-                           f"({tmpfs['use_percent']})\n")
+                    f.write(f"  {tmpfs['mountpoint']}: {tmpfs['used'] / (1024**2):.1f} / "
+                           f"{tmpfs['size'] / (1024**2):.1f} MB ({tmpfs['use_percent']}%)\n")
                            
             if shared['sysv_shm']:
                 f.write("System V Shared Memory Segments:\n")
@@ -545,13 +2313,77 @@ class MemoryInvestigator:
             f.write(f"Reclaimable: {slab['slab_reclaimable'] / (1024**2):.1f} MB\n")
             f.write(f"Unreclaimable: {slab['slab_unreclaimable'] / (1024**2):.1f} MB\n")
             
-            if slab['top_slab_caches']:
+            if snapshot['slab_caches']:
                 f.write("Top 5 Slab Caches:\n")
-                for cache in slab['top_slab_caches'][:5]:
+                for cache in snapshot['slab_caches'][:5]:
                     f.write(f"  {cache['name']}: {cache['total_size'] / (1024**2):.1f} MB "
                            f"({cache['total_objects']} objects)\n")
+                growers = sorted((c for c in snapshot['slab_caches'] if c.get('growth', 0) > 0),
+                                 key=lambda c: c['growth'], reverse=True)
+                if growers:
+                    f.write("Fastest Growing Slab Caches (since previous read):\n")
+                    for cache in growers[:5]:
+                        f.write(f"  {cache['name']}: {cache['growth'] / 1024:+.1f} KB "
+                               f"({cache['run_growth'] / (1024**2):+.2f} MB over the run)\n")
             f.write("\n")
             
+            # NUMA nodes and zones
+            numa = snapshot.get('numa')
+            if numa:
+                f.write("NUMA NODES:\n")
+                f.write("-" * 40 + "\n")
+                for node, fields in numa.items():
+                    f.write(f"  {node}: free {fields.get('MemFree', 0) / (1024**2):.1f} MB, "
+                           f"unevictable {fields.get('Unevictable', 0) / (1024**2):.1f} MB, "
+                           f"mlocked {fields.get('Mlocked', 0) / (1024**2):.1f} MB, "
+                           f"unreclaimable slab {fields.get('SUnreclaim', 0) / (1024**2):.1f} MB\n")
+                for zone, fields in unevictable['unevictable_breakdown'].items():
+                    if fields.get('unevictable_pages'):
+                        f.write(f"  {zone}: unevictable {fields['unevictable_pages'] / (1024**2):.1f} MB, "
+                               f"free {fields.get('free', 0) / (1024**2):.1f} MB\n")
+                f.write("\n")
+            
+            # Pressure stall information and reclaim rates
+            pressure = snapshot.get('pressure')
+            if pressure and pressure['available']:
+                rates = pressure['rates']
+                f.write("MEMORY PRESSURE:\n")
+                f.write("-" * 40 + "\n")
+                for kind in ('some', 'full'):
+                    psi = pressure[kind]
+                    f.write(f"PSI {kind}: avg10={psi.get('avg10', 0):.2f}% avg60={psi.get('avg60', 0):.2f}% "
+                           f"total={psi.get('total', 0) / 1000:.0f} ms\n")
+                if rates:
+                    f.write(f"Reclaim over last {pressure['interval_s']:.1f}s: "
+                           f"pgscan {rates['pgscan']:.0f}/s, pgsteal {rates['pgsteal']:.0f}/s, "
+                           f"allocstall {rates['allocstall']:.1f}/s, compact_stall {rates['compact_stall']:.1f}/s, "
+                           f"full stall {rates['full_stall_ms']:.1f} ms/s\n")
+                f.write("\n")
+            
+            # Kernel log events
+            kernel_events = snapshot.get('kernel_events')
+            if kernel_events and kernel_events['available']:
+                counts = kernel_events['counts']
+                f.write("KERNEL MEMORY EVENTS (this run):\n")
+                f.write("-" * 40 + "\n")
+                f.write(", ".join(f"{kind} {counts[kind]}" for kind in KERNEL_EVENT_KINDS) + "\n")
+                for event in kernel_events['events'][-5:]:
+                    f.write(f"  {event['time'][11:19]} [{event['kind']}] {event['message']}\n")
+                f.write("\n")
+            
+            # Cgroup v2 units
+            cgroups = snapshot.get('cgroups')
+            if cgroups and cgroups['units']:
+                f.write("CGROUP MEMORY (top 10 units):\n")
+                f.write("-" * 40 + "\n")
+                for unit in cgroups['units'][:10]:
+                    f.write(f"  {unit['path']}: {unit['current'] / (1024**2):.1f} MB "
+                           f"(anon {unit['anon'] / (1024**2):.1f}, file {unit['file'] / (1024**2):.1f}, "
+                           f"unevictable {unit['unevictable'] / (1024**2):.1f}, "
+                           f"slab {unit['slab'] / (1024**2):.1f}, sock {unit['sock'] / (1024**2):.1f} MB; "
+                           f"full pressure {unit['pressure_full_avg10']:.2f}%)\n")
+                f.write("\n")
+            
             # HugePages Analysis
             hugepages = snapshot['hugepages']
             if hugepages['hugepages_total'] > 0:
@@ -580,11 +2412,13 @@ class MemoryInvestigator:
             f.write(f"Swap Used: {snapshot['swap_memory']['used'] / (1024**2):.1f} MB\n")
             
     def analyze_trends(self):
-        """Analyze memory trends and generate report"""
-        if len(self.snapshots) < 2:
+        """Write the analysis report from the online statistics"""
+        analyzer = self.analyzer
+        if analyzer.snapshots < 2:
             return
             
         report_file = self.output_dir / "analysis_report.txt"
+        mb = 1024**2
         
         with open(report_file, 'w') as f:
             f.write("Memory Investigation Analysis Report\n")
@@ -592,67 +2426,34 @@ class MemoryInvestigator:
             
             f.write(f"Investigation Duration: {self.duration} minutes\n")
             f.write(f"Collection Interval: {self.interval} seconds\n")
-            f.write(f"Total Snapshots: {len(self.snapshots)}\n\n")
+            f.write(f"Total Snapshots: {analyzer.snapshots}\n\n")
             
             # UNEVICTABLE MEMORY ANALYSIS - This is the key section
             f.write("UNEVICTABLE MEMORY TREND ANALYSIS:\n")
             f.write("=" * 50 + "\n")
-            
-            unevictable_trend = []
-            mlocked_trend = []
-            slab_unreclaimable_trend = []
-            page_tables_trend = []
-            kernel_stack_trend = []
-            
-            for snapshot in self.snapshots:
-                timestamp = datetime.fromisoformat(snapshot['timestamp'])
-                unevictable = snapshot['unevictable_memory']
-                slab = snapshot['slab_memory']
-                
-                unevictable_mb = unevictable['total_unevictable'] / (1024**2)
-                mlocked_mb = unevictable['mlocked_pages'] / (1024**2)
-                slab_unreclaimable_mb = slab['slab_unreclaimable'] / (1024**2)
-                page_tables_mb = unevictable['page_tables'] / (1024**2)
-                kernel_stack_mb = unevictable['kernel_stack'] / (1024**2)
-                
-                unevictable_trend.append((timestamp, unevictable_mb))
-                mlocked_trend.append((timestamp, mlocked_mb))
-                slab_unreclaimable_trend.append((timestamp, slab_unreclaimable_mb))
-                page_tables_trend.append((timestamp, page_tables_mb))
-                kernel_stack_trend.append((timestamp, kernel_stack_mb))
-                
-                f.write(f"{timestamp.strftime('%H:%M:%S')}: "
-                       f"Unevictable={unevictable_mb:.1f}MB, "
-                       f"Mlocked={mlocked_mb:.1f}MB, "
-                       f"SlabUnreclaim={slab_unreclaimable_mb:.1f}MB, "
-                       f"PageTables={page_tables_mb:.1f}MB, "
-                       f"KernelStack={kernel_stack_mb:.1f}MB\n")
+            self._write_unevictable_timeline(f)
             
             # Calculate growth rates for unevictable memory components
             f.write(f"\nUnevictable Memory Growth Analysis:\n")
             f.write("-" * 40 + "\n")
             
-            initial_unevictable = unevictable_trend[0][1]
-            final_unevictable = unevictable_trend[-1][1]
-            unevictable_growth = final_unevictable - initial_unevictable
+            system = analyzer.system
+            unevictable_growth = system['unevictable'].change / mb
+            initial_unevictable = system['unevictable'].first / mb
             unevictable_growth_rate = (unevictable_growth / initial_unevictable * 100) if initial_unevictable > 0 else 0
+            mlocked_growth = system['mlocked'].change / mb
+            slab_growth = system['slab_unreclaimable'].change / mb
+            page_tables_growth = system['page_tables'].change / mb
             
             f.write(f"Total Unevictable Growth: {unevictable_growth:.1f} MB ({unevictable_growth_rate:.1f}%)\n")
-            
-            initial_mlocked = mlocked_trend[0][1]
-            final_mlocked = mlocked_trend[-1][1]
-            mlocked_growth = final_mlocked - initial_mlocked
             f.write(f"Mlocked Memory Growth: {mlocked_growth:.1f} MB\n")
-            
-            initial_slab = slab_unreclaimable_trend[0][1]
-            final_slab = slab_unreclaimable_trend[-1][1]
-            slab_growth = final_slab - initial_slab
             f.write(f"Unreclaimable Slab Growth: {slab_growth:.1f} MB\n")
-            
-            initial_page_tables = page_tables_trend[0][1]
-            final_page_tables = page_tables_trend[-1][1]
-            page_tables_growth = final_page_tables - initial_page_tables
             f.write(f"Page Tables Growth: {page_tables_growth:.1f} MB\n")
+            f.write("Fitted growth rates (least squares):\n")
+            for name, stats in system.items():
+                f.write(f"  {name}: {stats.slope * 3600 / mb:+.2f} MB/hour "
+                        f"(mean {stats.mean / mb:.1f} MB, stddev {stats.stddev / mb:.2f} MB, "
+                        f"recent {stats.ewma / mb:.1f} MB)\n")
             
             # Identify the biggest contributor to unevictable memory growth
             f.write(f"\nBiggest Contributors to Unevictable Memory Growth:\n")
@@ -661,7 +2462,7 @@ class MemoryInvestigator:
                 ("Mlocked Memory", mlocked_growth),
                 ("Unreclaimable Slab", slab_growth),
                 ("Page Tables", page_tables_growth),
-                ("Kernel Stack", kernel_stack_trend[-1][1] - kernel_stack_trend[0][1])
+                ("Kernel Stack", system['kernel_stack'].change / mb)
             ]
             contributors.sort(key=lambda x: abs(x[1]), reverse=True)
             
@@ -673,80 +2474,149 @@ class MemoryInvestigator:
             f.write(f"\nSlab Cache Growth Analysis:\n")
             f.write("-" * 40 + "\n")
             
-            if len(self.snapshots) >= 2:
-                first_slab = self.snapshots[0]['slab_memory']['top_slab_caches']
-                last_slab = self.snapshots[-1]['slab_memory']['top_slab_caches']
-                
-                # Create lookup for comparison
-                first_slab_dict = {cache['name']: cache['total_size'] for cache in first_slab}
-                last_slab_dict = {cache['name']: cache['total_size'] for cache in last_slab}
+            last_caches = analyzer.last_slab_caches or []
+            if last_caches and 'run_growth' in last_caches[0]:
+                # Every cache is tracked, so small caches that grow fast show up too
+                growers = sorted((c for c in last_caches if c['run_growth'] > 0),
+                                 key=lambda c: c['run_growth'], reverse=True)
+                for cache in growers[:10]:
+                    f.write(f"{cache['name']}: {cache['run_growth'] / mb:+.2f} MB "
+                            f"({cache['run_growth_mb_per_hour']:+.2f} MB/hour, "
+                            f"now {cache['total_size'] / mb:.1f} MB)\n")
+                if not growers:
+                    f.write("No slab cache grew during the run\n")
+            else:
+                # Logs written before per-cache tracking: diff the first and last top lists
+                first_slab_dict = {cache['name']: cache['total_size'] for cache in analyzer.first_slab_caches or []}
+                last_slab_dict = {cache['name']: cache['total_size'] for cache in last_caches}
                 
                 slab_growths = []
                 for cache_name in set(first_slab_dict.keys()) | set(last_slab_dict.keys()):
-                    initial_size = first_slab_dict.get(cache_name, 0)
-                    final_size = last_slab_dict.get(cache_name, 0)
-                    growth = final_size - initial_size
+                    growth = last_slab_dict.get(cache_name, 0) - first_slab_dict.get(cache_name, 0)
                     if abs(growth) > 1024*1024:  # Only show changes > 1MB
-                        slab_growths.append((cache_name, growth / (1024**2)))
+                        slab_growths.append((cache_name, growth / mb))
                 
                 slab_growths.sort(key=lambda x: abs(x[1]), reverse=True)
                 for cache_name, growth_mb in slab_growths[:10]:
                     f.write(f"{cache_name}: {growth_mb:+.1f} MB\n")
             
+            # Per-node view: growth concentrated on one node can starve it
+            # while the system totals still look healthy
+            if analyzer.numa:
+                f.write(f"\nPer-NUMA-Node Memory:\n")
+                f.write("-" * 40 + "\n")
+                for node, fields in sorted(analyzer.numa.items(), key=lambda x: int(x[0][4:])):
+                    f.write(f"{node}: " + ", ".join(
+                        f"{field} {stats.last / mb:.1f} MB ({stats.change / mb:+.1f})"
+                        for field, stats in fields.items() if stats.n) + "\n")
+            
+            # Attribute unevictable/slab growth to systemd units
+            if analyzer.cgroups:
+                f.write(f"\nCgroup Memory Growth (unevictable + slab):\n")
+                f.write("-" * 40 + "\n")
+                for unit in analyzer.cgroup_growth()[:10]:
+                    if abs(unit['unevictable']) + abs(unit['slab']) + abs(unit['current']) < 1024*1024:
+                        continue
+                    f.write(f"{unit['path']}: unevictable {unit['unevictable'] / mb:+.1f} MB, "
+                            f"slab {unit['slab'] / mb:+.1f} MB, total {unit['current'] / mb:+.1f} MB "
+                            f"({unit['current_mb_per_hour']:+.1f} MB/hour, now {unit['current_mb']:.1f} MB, "
+                            f"stalled {unit['stall_ms']:.0f} ms)\n")
+            
             # Processes with mlocked memory analysis
             f.write(f"\nProcesses with Mlocked Memory:\n")
             f.write("-" * 40 + "\n")
             
-            mlocked_processes = {}
-            for snapshot in self.snapshots:
-                for proc in snapshot['unevictable_memory']['processes_with_mlocked']:
-                    pid = proc['pid']
-                    name = proc['name']
-                    mlocked_kb = proc['mlocked_kb']
-                    
-                    if pid not in mlocked_processes:
-                        mlocked_processes[pid] = {
-                            'name': name,
-                            'samples': [],
-                            'max_mlocked': mlocked_kb
-                        }
-                    mlocked_processes[pid]['samples'].append(mlocked_kb)
-                    mlocked_processes[pid]['max_mlocked'] = max(mlocked_processes[pid]['max_mlocked'], mlocked_kb)
-            
-            # Sort by max mlocked memory
-            sorted_mlocked = sorted(mlocked_processes.items(), 
-                                  key=lambda x: x[1]['max_mlocked'], reverse=True)
-            
-            for pid, info in sorted_mlocked[:10]:
-                max_mb = info['max_mlocked'] / (1024**2)
-                avg_mb = sum(info['samples']) / len(info['samples']) / (1024**2)
-                f.write(f"PID {pid} ({info['name']}): Max={max_mb:.1f}MB, Avg={avg_mb:.1f}MB\n")
-            
-            # Memory usage trend
+            sorted_mlocked = sorted(analyzer.mlocked_processes.items(),
+                                  key=lambda x: x[1]['mlocked'].max, reverse=True)
+            for (pid, _), info in sorted_mlocked[:10]:
+                stats = info['mlocked']
+                f.write(f"PID {pid} ({analyzer.strings[info['name']]}): Max={stats.max / mb:.1f}MB, "
+                        f"Avg={stats.mean / mb:.1f}MB\n")
+            
             f.write(f"\nOverall Memory Usage Trend:\n")
             f.write("-" * 30 + "\n")
-            for i, snapshot in enumerate(self.snapshots):
-                timestamp = datetime.fromisoformat(snapshot['timestamp'])
-                mem_percent = snapshot['system_memory']['percent']
-                f.write(f"{timestamp.strftime('%H:%M:%S')}: {mem_percent:.1f}%\n")
+            self._write_usage_timeline(f)
             
             # Find processes with increasing memory usage
             f.write(f"\nPotential Memory Leaks (increasing memory usage):\n")
             f.write("-" * 50 + "\n")
-            
-            process_trends = self._analyze_process_trends()
-            for pid, trend in process_trends.items():
-                if trend['increasing'] and trend['samples'] >= 3:
-                    f.write(f"PID {pid}: {trend['name']} - "
-                           f"Memory increased by {trend['increase']:.1f}%\n")
+            self._write_leak_detection(f)
                            
+            # Collection scheduling
+            f.write(f"\nCollection Scheduling:\n")
+            f.write("-" * 30 + "\n")
+            if analyzer.latency.n:
+                f.write(f"Collection latency: avg {analyzer.latency.mean:.1f} ms, "
+                        f"max {analyzer.latency.max:.1f} ms\n")
+            if analyzer.start_lag.n:
+                f.write(f"Tick start lag: avg {analyzer.start_lag.mean:.1f} ms, "
+                        f"max {analyzer.start_lag.max:.1f} ms\n")
+            f.write(f"Missed ticks: {self.scheduler_stats['missed']}, "
+                    f"overrun ticks: {self.scheduler_stats['overruns']}\n")
+            for key, count in sorted(analyzer.skipped_counts.items()):
+                f.write(f"Skipped {key} on {count} tick(s) to stay within the interval\n")
+            if analyzer.bursts:
+                f.write(f"PSI trigger bursts: {len(analyzer.bursts)} "
+                        f"({analyzer.burst_snapshots} high-rate snapshots)\n")
+
+            # What the investigator itself cost the host
+            overhead = analyzer.overhead
+            if overhead['rss'].n:
+                f.write(f"\nInvestigator Overhead:\n")
+                f.write("-" * 30 + "\n")
+                f.write(f"Own RSS: avg {overhead['rss'].mean / (1024**2):.1f} MB, "
+                        f"max {overhead['rss'].max / (1024**2):.1f} MB "
+                        f"({overhead['rss'].change / (1024**2):+.1f} MB over the run)\n")
+                f.write(f"CPU per collection: avg {overhead['cpu_ms'].mean:.1f} ms, "
+                        f"max {overhead['cpu_ms'].max:.1f} ms\n")
+                if analyzer.cpu_total.span > 0:
+                    share = analyzer.cpu_total.change / (analyzer.cpu_total.span * 1000) * 100
+                    f.write(f"Total CPU during the run (collection, logging, reports): "
+                            f"{analyzer.cpu_total.change:.0f} ms, {share:.2f}% of one core\n")
+                f.write(f"Per collection: avg {overhead['files_opened'].mean:.0f} files opened, "
+                        f"{overhead['read_syscalls'].mean:.0f} read and "
+                        f"{overhead['write_syscalls'].mean:.0f} write syscalls, "
+                        f"{overhead['read_bytes'].mean / 1024:.0f} KB read\n")
+                f.write(f"{'Section':<20} {'Wall avg':>9} {'Wall max':>9} {'CPU avg':>9} {'Opens avg':>10}\n")
+                for key, entry in sorted(analyzer.section_overhead.items(),
+                                         key=lambda item: item[1]['ms'].mean, reverse=True):
+                    f.write(f"{key:<20} {entry['ms'].mean:>7.1f}ms {entry['ms'].max:>7.1f}ms "
+                            f"{entry['cpu_ms'].mean:>7.1f}ms {entry['opens'].mean:>10.0f}\n")
+
+            # Memory pressure and reclaim
+            if analyzer.psi['some'].n:
+                f.write(f"\nMemory Pressure and Reclaim:\n")
+                f.write("-" * 30 + "\n")
+                for kind, stats in analyzer.psi.items():
+                    f.write(f"PSI {kind} avg10: avg {stats.mean:.2f}%, peak {stats.max:.2f}%\n")
+                f.write(f"Full stall time during run: {analyzer.psi_full_total.change / 1000:.0f} ms\n")
+                for name, stats in analyzer.reclaim.items():
+                    if stats.n:
+                        unit = 'ms/s' if name.endswith('_ms') else '/s'
+                        f.write(f"{name}: avg {stats.mean:.1f} {unit}, peak {stats.max:.1f} {unit}\n")
+                self._write_pressure_correlation(f)
+            
+            # Kernel log events
+            if analyzer.kernel_events_available:
+                f.write(f"\nKernel Memory Events:\n")
+                f.write("-" * 30 + "\n")
+                for kind in KERNEL_EVENT_KINDS:
+                    f.write(f"{kind}: {analyzer.kernel_event_counts.get(kind, 0)}\n")
+                if analyzer.kernel_records_lost:
+                    f.write(f"Kernel log records overwritten before they were read: "
+                            f"{analyzer.kernel_records_lost}\n")
+                if analyzer.kernel_events:
+                    f.write(f"Most recent events:\n")
+                    for event in analyzer.kernel_events:
+                        f.write(f"  {event['time']} [{event['kind']}] {event['message']}\n")
+            
             # System memory statistics
+            mem_usage = analyzer.memory_percent
             f.write(f"\nSystem Memory Statistics:\n")
             f.write("-" * 30 + "\n")
-            mem_usage = [s['system_memory']['percent'] for s in self.snapshots]
-            f.write(f"Average usage: {sum(mem_usage)/len(mem_usage):.1f}%\n")
-            f.write(f"Peak usage: {max(mem_usage):.1f}%\n")
-            f.write(f"Minimum usage: {min(mem_usage):.1f}%\n")
+            f.write(f"Average usage: {mem_usage.mean:.1f}%\n")
+            f.write(f"Peak usage: {mem_usage.max:.1f}%\n")
+            f.write(f"Minimum usage: {mem_usage.min:.1f}%\n")
             
             # Diagnostic recommendations
             f.write(f"\nDIAGNOSTIC RECOMMENDATIONS:\n")
@@ -772,7 +2642,13 @@ class MemoryInvestigator:
                     f.write("  - Check for processes with large virtual memory spaces\n")
                     f.write("  - Look for memory fragmentation issues\n")
                     f.write("  - Consider: large applications, many threads/processes\n\n")
-            
+
+            event_counts = analyzer.kernel_event_counts
+            if event_counts.get('oom_kill') or event_counts.get('alloc_failure'):
+                f.write(f"⚠️  KERNEL REPORTED {event_counts.get('oom_kill', 0)} OOM KILL(S) AND "
+                        f"{event_counts.get('alloc_failure', 0)} ALLOCATION FAILURE(S) DURING THE RUN\n")
+                f.write("  - See Kernel Memory Events above for the times and victims\n\n")
+
             f.write("Additional Investigation Commands:\n")
             f.write("• cat /proc/meminfo | grep -E '(Unevictable|Mlocked|Slab)'\n")
             f.write("• sudo cat /proc/slabinfo | sort -k3 -n | tail -20\n")
@@ -785,36 +2661,80 @@ class MemoryInvestigator:
         # Also create a focused unevictable memory report
         self._create_unevictable_diagnostic_report()
         
-    def _analyze_process_trends(self) -> Dict[int, Dict[str, Any]]:
-        """Analyze memory trends for individual processes"""
-        process_data = {}
-        
-        for snapshot in self.snapshots:
-            for proc in snapshot['processes']:
-                pid = proc['pid']
-                if pid not in process_data:
-                    process_data[pid] = {
-                        'name': proc['name'],
-                        'memory_samples': [],
-                        'samples': 0,
-                        'increasing': False,
-                        'increase': 0
-                    }
-                
-                process_data[pid]['memory_samples'].append(proc['memory_percent'])
-                process_data[pid]['samples'] += 1
+    def _write_unevictable_timeline(self, f, buckets: int = 20):
+        """Write a downsampled unevictable timeline from the columnar metrics store"""
+        metrics_dir = self.output_dir / "metrics"
+        if not (metrics_dir / "index.json").exists():
+            f.write("(no metrics store available for a timeline)\n")
+            return
+        reader = MetricReader(metrics_dir)
+        columns = [('Unevictable', 'meminfo.Unevictable'), ('Mlocked', 'meminfo.Mlocked'),
+                   ('SlabUnreclaim', 'meminfo.SUnreclaim'), ('PageTables', 'meminfo.PageTables'),
+                   ('KernelStack', 'meminfo.KernelStack')]
+        series = [(label, reader.downsample(column, buckets))
+                  for label, column in columns if column in reader.columns]
+        if not series:
+            return
+        for i, (start, _, _, _) in enumerate(series[0][1]):
+            values = ", ".join(f"{label}={points[i][2] / (1024**2):.1f}MB" for label, points in series)
+            f.write(f"{datetime.fromtimestamp(start).strftime('%H:%M:%S')}: {values}\n")
+
+    def _write_leak_detection(self, f):
+        """Write Theil-Sen leak suspects, or the online least-squares list without numpy"""
+        metrics_dir = self.output_dir / "metrics"
+        if np is None or not (metrics_dir / "index.json").exists():
+            f.write("(robust detection needs numpy and a metrics store; least-squares fit below)\n")
+            f.write(self.analyzer.format_suspects())
+            return
+        detector = LeakDetector(MetricReader(metrics_dir))
+        f.write("System-wide (Theil-Sen):\n")
+        for growth in detector.system_growth():
+            f.write(f"  {growth['metric']}: {growth['mb_per_hour']:+.2f} MB/hour "
+                    f"(confidence {growth['confidence']:.2f}, now {growth['last_mb']:.1f} MB)\n")
+        suspects = detector.leaks()
+        if not suspects:
+            f.write("No process series with confident sustained growth "
+                    "(needs at least 10 minutes of data and 4 MB of growth)\n")
+        for suspect in suspects[:15]:
+            f.write(f"PID {suspect['pid']}: {suspect['name']} - {suspect['metric'].upper()} "
+                    f"{suspect['mb_per_hour']:+.1f} MB/hour (confidence {suspect['confidence']:.2f}, "
+                    f"now {suspect['last_mb']:.1f} MB, {suspect['buckets']} buckets)"
+                    f"{' in ' + suspect['cgroup'] if suspect['cgroup'] else ''}\n")
         
-        # Analyze trends
-        for pid, data in process_data.items():
-            if len(data['memory_samples']) >= 3:
-                first = data['memory_samples'][0]
-                last = data['memory_samples'][-1]
-                increase = last - first
-                
-                data['increasing'] = increase > 0.5  # More than 0.5% increase
-                data['increase'] = increase
+    def _write_pressure_correlation(self, f):
+        """Correlate per-interval unevictable growth with full-stall time (needs numpy)"""
+        metrics_dir = self.output_dir / "metrics"
+        if np is None or not (metrics_dir / "index.json").exists():
+            return
+        reader = MetricReader(metrics_dir)
+        if reader.rows < 3 or not {'meminfo.Unevictable', 'psi.full_total'} <= set(reader.columns):
+            return
+        growth = np.diff(np.asarray(reader.column('meminfo.Unevictable'), dtype=np.float64))
+        stall = np.diff(np.asarray(reader.column('psi.full_total'), dtype=np.float64))
+        if growth.std() == 0 or stall.std() == 0:
+            f.write("Unevictable growth vs stall time: no variation to correlate\n")
+            return
+        f.write(f"Unevictable growth vs stall time correlation: "
+                f"{np.corrcoef(growth, stall)[0, 1]:+.2f} (per interval, Pearson)\n")
         
-        return process_data
+    def _write_usage_timeline(self, f, buckets: int = 20):
+        """Write downsampled system memory usage (percent) from the columnar metrics store"""
+        metrics_dir = self.output_dir / "metrics"
+        if not (metrics_dir / "index.json").exists():
+            f.write("(no metrics store available for a timeline)\n")
+            return
+        reader = MetricReader(metrics_dir)
+        if not {'meminfo.MemTotal', 'meminfo.MemAvailable'} <= set(reader.columns):
+            return
+        totals = reader.downsample('meminfo.MemTotal', buckets)
+        available = reader.downsample('meminfo.MemAvailable', buckets)
+        for (start, _, total, _), (_, low, mean, high) in zip(totals, available):
+            if total <= 0:
+                continue
+            # Least available memory in a bucket is its peak usage
+            f.write(f"{datetime.fromtimestamp(start).strftime('%H:%M:%S')}: "
+                    f"{(total - mean) / total * 100:.1f}% "
+                    f"(peak {(total - low) / total * 100:.1f}%, low {(total - high) / total * 100:.1f}%)\n")
         
     def _create_unevictable_diagnostic_report(self):
         """Create a specialized diagnostic report for unevictable memory"""
@@ -825,8 +2745,8 @@ class MemoryInvestigator:
             f.write("=" * 50 + "\n\n")
             
             # Current snapshot analysis
-            if self.snapshots:
-                latest = self.snapshots[-1]
+            if self.latest_snapshot:
+                latest = self.latest_snapshot
                 unevictable = latest['unevictable_memory']
                 slab = latest['slab_memory']
                 
@@ -854,7 +2774,7 @@ class MemoryInvestigator:
                 # Top slab caches
                 f.write(f"Top 10 Slab Caches (by size):\n")
                 f.write("-" * 30 + "\n")
-                for i, cache in enumerate(slab['top_slab_caches'][:10], 1):
+                for i, cache in enumerate((latest['slab_caches'] or [])[:10], 1):
                     f.write(f"{i:2d}. {cache['name']:<25} {cache['total_size']/(1024**2):>8.1f} MB "
                            f"({cache['total_objects']:>8} objects)\n")
                 f.write("\n")
@@ -924,6 +2844,51 @@ class MemoryInvestigator:
             
         print(f"Unevictable diagnostic report saved: {diagnostic_file}")
         
+    def _request_suspects(self, signum, frame):
+        """SIGUSR1 handler: ask the collection loop for a leak suspect report"""
+        self.suspects_requested = True
+        
+    def _terminate(self, signum, frame):
+        """SIGTERM handler: stop collecting, then close the stores and report as on Ctrl-C"""
+        self.terminated = True
+        raise KeyboardInterrupt
+        
+    def _print_requested_suspects(self):
+        """Print leak suspects if SIGUSR1 arrived since the last check"""
+        if self.suspects_requested:
+            self.suspects_requested = False
+            print(f"\n--- Leak suspects after {self.analyzer.snapshots} snapshots ---\n"
+                  f"{self.analyzer.format_suspects()}", flush=True)
+        
+    def _capture_burst(self, scheduler: TickScheduler, burst: int, end_time: float):
+        """Collect every section each burst_interval for burst_seconds after a PSI trigger"""
+        started = time.monotonic()
+        until = min(started + self.burst_seconds, end_time)
+        print(f"\n--- PSI trigger fired; burst sampling for {until - started:.1f}s ---")
+        sample = 0
+        while True:
+            due = started + sample * self.burst_interval
+            if due >= until:
+                break
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            # No tick index and no deadline: every section is due and none is skipped
+            snapshot = self.collect_system_snapshot()
+            snapshot['tick'] = {
+                'index': scheduler.index,
+                'scheduled_offset_s': round(scheduler.index * self.interval, 3),
+                'missed_before': 0,
+                'burst': burst,
+                'burst_sample': sample,
+                'weight': round(min(1.0, self.burst_interval / self.interval), 6),
+                'burst_offset_s': round(time.monotonic() - started, 3)
+            }
+            self.save_snapshot(snapshot)
+            # Fall behind rather than burst through missed samples
+            sample = max(sample + 1, int((time.monotonic() - started) // self.burst_interval))
+        print(f"Burst {burst} done: {sample} snapshots")
+        
     def run_investigation(self):
         """Run the complete memory investigation"""
         self.setup_output_dir()
@@ -935,31 +2900,75 @@ class MemoryInvestigator:
         if os.geteuid() != 0:
             print("WARNING: Not running as root. Some detailed information may be unavailable.")
         
-        start_time = time.time()
-        end_time = start_time + (self.duration * 60)
-        iteration = 1
+        # The handler only raises a flag; suspects are printed between ticks
+        # so the report never interleaves with a half-written snapshot
+        print(f"Send SIGUSR1 (kill -USR1 {os.getpid()}) to print current leak suspects")
+        previous_handler = signal.signal(signal.SIGUSR1, self._request_suspects)
+        previous_term_handler = signal.signal(signal.SIGTERM, self._terminate)
+        
+        trigger = None
+        if self.psi_trigger_ms:
+            try:
+                trigger = PressureTrigger(self.psi_trigger_ms, self.psi_window)
+                print(f"PSI trigger armed: {self.psi_trigger_ms} ms memory stall within "
+                      f"{self.psi_window}s starts {self.burst_seconds}s of "
+                      f"{self.burst_interval}s sampling")
+            except OSError as e:
+                print(f"WARNING: Cannot register PSI trigger ({e}); polling only")
+        
+        scheduler = TickScheduler(self.interval)
+        end_time = scheduler.start + (self.duration * 60)
         
         try:
-            while time.time() < end_time:
-                print(f"\n--- Iteration {iteration} ---")
-                snapshot = self.collect_system_snapshot()
-                self.snapshots.append(snapshot)
-                self.save_snapshot(snapshot)
-                
-                remaining_time = end_time - time.time()
-                if remaining_time > self.interval:
-                    print(f"Waiting {self.interval}s until next collection...")
-                    time.sleep(self.interval)
-                else:
+            while True:
+                if trigger is not None:
+                    # Sleep in poll() on the trigger instead of time.sleep, leaving
+                    # the last few ms to wait_next so a late poll() wakeup is not
+                    # mistaken for an overrun
+                    wake = min(scheduler.deadline(scheduler.index + 1), end_time) - 0.005
+                    if trigger.wait(wake - time.monotonic()):
+                        self._capture_burst(scheduler, trigger.fired, end_time)
+                        scheduler.resync()
+                        continue
+                tick = scheduler.wait_next(end_time)
+                if tick is None:
                     break
+                self._print_requested_suspects()
                     
-                iteration += 1
+                print(f"\n--- Iteration {tick['index'] + 1} ---")
+                if tick['missed_before']:
+                    print(f"Previous collection overran; skipped {tick['missed_before']} tick(s)")
+                deadline = tick.pop('budget_deadline')
+                snapshot = self.collect_system_snapshot(deadline=deadline, tick_index=tick['index'])
+                snapshot['tick'] = tick
+                self.save_snapshot(snapshot)
+                
+                collection = snapshot['collection']
+                if collection['skipped_sections']:
+                    print(f"Skipped over-budget sections: {', '.join(collection['skipped_sections'])}")
+                print(f"Collected in {collection['latency_ms']:.0f} ms "
+                      f"({collection['self']['cpu_ms']:.0f} ms CPU, "
+                      f"own RSS {collection['self']['rss'] / (1024**2):.0f} MB); "
+                      f"next collection in {max(0, scheduler.deadline(tick['index'] + 1) - time.monotonic()):.1f}s")
                 
         except KeyboardInterrupt:
-            print("\nInvestigation interrupted by user")
+            print("\nInvestigation terminated" if self.terminated
+                  else "\nInvestigation interrupted by user")
+        finally:
+            if trigger is not None:
+                trigger.close()
+            signal.signal(signal.SIGUSR1, previous_handler)
+            signal.signal(signal.SIGTERM, previous_term_handler)
+            self.pool.shutdown()
+            self.kmsg.close()
+            self.log.close()
+            self.log = None
+            self.metrics.close()
             
         print(f"\nInvestigation complete!")
-        print(f"Collected {len(self.snapshots)} snapshots")
+        print(f"Collected {self.snapshot_count} snapshots "
+              f"({scheduler.missed} missed ticks, {scheduler.overruns} overruns)")
+        self.scheduler_stats = {'missed': scheduler.missed, 'overruns': scheduler.overruns}
         
         self.analyze_trends()
         
@@ -983,6 +2992,62 @@ def main():
         '--duration', '-d', type=int, default=60,
         help='Total investigation duration in minutes (default: 60)'
     )
+    parser.add_argument(
+        '--workers', '-w', type=int, default=1,
+        help='Threads used to read per-process procfs files (default: 1, sequential)'
+    )
+    parser.add_argument(
+        '--cadence', '-c', action='append', default=[], metavar='SECTION=SECONDS',
+        help='Collect a section less often than every tick, carrying it forward in between '
+             '(repeatable). Sections: ' + ', '.join(MemoryInvestigator.SECTION_KEYS)
+    )
+    parser.add_argument(
+        '--no-budget-skip', action='store_true',
+        help='Always collect expensive sections, even when a tick would overrun the interval'
+    )
+    parser.add_argument(
+        '--compress', choices=sorted(LOG_SUFFIXES), default='none',
+        help='Compress the snapshot log in blocks (zstd needs the zstandard module)'
+    )
+    parser.add_argument(
+        '--keyframe-interval', type=int, default=60,
+        help='Log a full snapshot every N records and process-table deltas in between '
+             '(default: 60, 0 logs every snapshot in full)'
+    )
+    parser.add_argument(
+        '--cgroup-depth', type=int, default=3,
+        help='Levels of the cgroup v2 hierarchy to account per unit (default: 3)'
+    )
+    parser.add_argument(
+        '--psi-trigger', type=float, metavar='MS',
+        help='Arm a PSI trigger on /proc/pressure/memory: when MS of memory stall builds up '
+             'within --psi-window, sample every section at --burst-interval for --burst-seconds'
+    )
+    parser.add_argument(
+        '--psi-window', type=float, default=2.0,
+        help='PSI trigger window in seconds, 0.5-10 (default: 2; without CAP_SYS_RESOURCE '
+             'it must be a multiple of 2)'
+    )
+    parser.add_argument(
+        '--burst-seconds', type=float, default=10.0,
+        help='Length of a triggered burst in seconds (default: 10)'
+    )
+    parser.add_argument(
+        '--burst-interval', type=float, default=0.25,
+        help='Sampling interval during a burst in seconds (default: 0.25)'
+    )
+    parser.add_argument(
+        '--analyze-log', metavar='PATH',
+        help='Rebuild the analysis reports from an existing snapshot log and exit'
+    )
+    parser.add_argument(
+        '--query-metric', nargs=2, metavar=('METRICS_DIR', 'COLUMN'),
+        help='Print a downsampled column (e.g. meminfo.Unevictable) from a metrics store and exit'
+    )
+    parser.add_argument(
+        '--buckets', type=int, default=20,
+        help='Number of buckets for --query-metric (default: 20)'
+    )
     parser.add_argument(
         '--help-usage', action='store_true',
         help='Show detailed usage examples'
@@ -998,10 +3063,27 @@ Basic usage:
   python3 memory-investigator.py                    # 60min, 30s interval
   python3 memory-investigator.py -i 15 -d 30       # 30min, 15s interval
   sudo python3 memory-investigator.py              # Run as root for detailed info
+  sudo python3 memory-investigator.py -w 16        # Shard per-process reads over 16 threads
+
+Tiered cadence (meminfo/vmstat every second, process table every 10s,
+smaps and slabinfo every minute; other ticks carry the last values forward):
+  sudo python3 memory-investigator.py -i 1 -c processes=10 \\
+      -c memory_maps=60 -c memory_locks=60 -c slab_caches=60
+
+Cheap 30s polling, with 4 samples/s of everything for 10s whenever memory
+stall reaches 100ms within a 2s window:
+  sudo python3 memory-investigator.py --psi-trigger 100 --burst-seconds 10
+
+Long runs with a compressed log, and rebuilding reports from a log later:
+  sudo python3 memory-investigator.py -i 5 -d 1440 --compress gzip
+  python3 memory-investigator.py --analyze-log memory_investigation_*/snapshots.ndjson.gz
 
 The tool will create a timestamped directory with:
-  - JSON snapshots of system state
-  - Human-readable summaries
+  - snapshots.ndjson[.gz|.zst]: one compact JSON snapshot per line
+  - latest_summary.txt: human-readable summary of the newest snapshot,
+    including per-unit cgroup v2 memory (systemd services and slices)
+  - metrics/: columnar meminfo/vmstat/per-process series, e.g.
+      python3 memory-investigator.py --query-metric DIR/metrics meminfo.Unevictable
   - Analysis report identifying potential memory leaks
   - Process memory trends over time
 
@@ -1019,7 +3101,52 @@ For best results, run as root to get detailed memory maps.
         print("Error: psutil module required. Install with: pip install psutil")
         sys.exit(1)
     
-    investigator = MemoryInvestigator(args.interval, args.duration)
+    if args.interval <= 0:
+        parser.error("--interval must be a positive number of seconds")
+    
+    cadences = {}
+    for spec in args.cadence:
+        key, _, seconds = spec.partition('=')
+        if key not in MemoryInvestigator.SECTION_KEYS:
+            parser.error(f"unknown section '{key}' in --cadence {spec}")
+        try:
+            cadences[key] = float(seconds)
+        except ValueError:
+            parser.error(f"invalid seconds in --cadence {spec}")
+        if not math.isfinite(cadences[key]) or cadences[key] <= 0:
+            parser.error(f"seconds must be finite and greater than 0 in --cadence {spec}")
+    
+    for name in ('psi_trigger', 'psi_window', 'burst_seconds', 'burst_interval'):
+        value = getattr(args, name)
+        if value is not None and (not math.isfinite(value) or value <= 0):
+            parser.error(f"--{name.replace('_', '-')} must be finite and greater than 0")
+    
+    if args.compress == 'zstd' and zstandard is None:
+        parser.error("--compress zstd requires the zstandard module (pip install zstandard)")
+    
+    investigator = MemoryInvestigator(args.interval, args.duration, args.workers,
+                                      budget_skip=not args.no_budget_skip,
+                                      cadences=cadences, compression=args.compress,
+                                      keyframe_interval=args.keyframe_interval,
+                                      cgroup_depth=args.cgroup_depth,
+                                      psi_trigger_ms=args.psi_trigger, psi_window=args.psi_window,
+                                      burst_seconds=args.burst_seconds,
+                                      burst_interval=args.burst_interval)
+    if args.query_metric:
+        reader = MetricReader(args.query_metric[0])
+        column = args.query_metric[1]
+        if column not in reader.columns or column.startswith('process.'):
+            parser.error(f"unknown system column '{column}'")
+        print(f"{'Time':<20} {'Min':>16} {'Mean':>16} {'Max':>16}")
+        for start, low, mean, high in reader.downsample(column, args.buckets):
+            print(f"{datetime.fromtimestamp(start).strftime('%Y-%m-%d %H:%M:%S'):<20} "
+                  f"{low:>16.0f} {mean:>16.0f} {high:>16.0f}")
+        return
+    
+    if args.analyze_log:
+        investigator.load_log(args.analyze_log)
+        investigator.analyze_trends()
+        return
     investigator.run_investigation()
 
 
@@ -5,14 +5,23 @@ A terminal-based real-time chart showing unevictable memory usage over time
 """
 
 import asyncio
+import fcntl
 import json
+import math
+import mmap
 import os
+import signal
+import struct
 import sys
+import termios
 import time
+import tty
+from array import array
+from bisect import bisect_left
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
-from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 import argparse
 
 try:
@@ -32,13 +41,452 @@ except ImportError:
     sys.exit(1)
 
 
+def read_vmlck(pid: int) -> Optional[Tuple[str, int]]:
+    """Process name and VmLck (kB) from /proc/PID/status, or None if it is gone"""
+    try:
+        with open(f'/proc/{pid}/status', 'r') as f:
+            name = ''
+            for line in f:
+                if line.startswith('Name:'):
+                    name = line[5:].strip()
+                elif line.startswith('VmLck:'):
+                    return name, int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None  # exited, or a kernel thread without an mm
+
+
+# Braille cells are 2 dots wide and 4 tall; BRAILLE_DOTS[row][column] is the
+# bit for each dot and U+2800 + mask the character
+BRAILLE_DOTS = ((0x01, 0x08), (0x02, 0x10), (0x04, 0x20), (0x40, 0x80))
+BRAILLE_TABLE = {mask: chr(0x2800 + mask) for mask in range(256)}
+BLOCKS = ' ▁▂▃▄▅▆▇█'  # eighths of a cell
+CHART_STYLES = ('braille', 'block')
+
+
+def column_buckets(lows, highs, lasts, columns: int) -> List[Tuple[float, float, float]]:
+    """(min of lows, max of highs, last of lasts) of each of `columns` consecutive slices
+
+    Every point falls in exactly one slice, so a frame costs one pass over
+    the data whatever the chart width; with fewer points than columns a
+    point spans several columns.
+    """
+    n = len(lasts)
+    buckets = []
+    for column in range(columns):
+        start = column * n // columns
+        end = max((column + 1) * n // columns, start + 1)
+        buckets.append((min(lows[start:end]), max(highs[start:end]), lasts[end - 1]))
+    return buckets
+
+
+def rasterize_braille(buckets: List[Tuple[float, float, float]], low: float, high: float,
+                      rows: int) -> List[str]:
+    """Draw buckets as a line, two buckets per character and 4 dots per row
+
+    Each bucket is drawn as a vertical stroke from its min to its max,
+    extended to the previous bucket's last value so the line stays connected.
+    """
+    dots = rows * 4
+    scale = (dots - 1) / (high - low)
+    cells = [bytearray((len(buckets) + 1) // 2) for _ in range(rows)]
+    previous = None
+    for x, (bucket_min, bucket_max, last) in enumerate(buckets):
+        if previous is not None:
+            bucket_min, bucket_max = min(bucket_min, previous), max(bucket_max, previous)
+        previous = last
+        top = dots - 1 - int((bucket_max - low) * scale + 0.5)
+        bottom = dots - 1 - int((bucket_min - low) * scale + 0.5)
+        column, side = divmod(x, 2)
+        for y in range(top, bottom + 1):
+            row, dot = divmod(y, 4)
+            cells[row][column] |= BRAILLE_DOTS[dot][side]
+    return [row.decode('latin-1').translate(BRAILLE_TABLE) for row in cells]
+
+
+def rasterize_blocks(buckets: List[Tuple[float, float, float]], low: float, high: float,
+                     rows: int) -> List[str]:
+    """Draw each bucket's max as a filled column, in eighths of a row"""
+    scale = rows * 8 / (high - low)
+    levels = [int((bucket_max - low) * scale + 0.5) for _, bucket_max, _ in buckets]
+    return [''.join(BLOCKS[min(8, max(0, level - (rows - 1 - row) * 8))] for level in levels)
+            for row in range(rows)]
+
+
+# History tiers as (resolution, span) in seconds, finest first. Each tier is
+# fed the buckets the one below it closes, so memory is fixed (about 1.6 MB)
+# however long the monitor runs.
+HISTORY_TIERS = ((1, 10 * 60), (10, 6 * 3600), (60, 7 * 86400))
+HISTORY_FIELDS = ('total_unevictable_mb', 'mlocked_mb', 'slab_unreclaimable_mb',
+                  'memory_percent', 'psi_full_avg10')
+HISTORY_STATS = ('min', 'max', 'mean')
+
+# History file layout, all little-endian:
+#   FILE_HEADER: magic, version, tier count, field count, samples added
+#   one FIELD_NAME per field (NUL-padded ASCII)
+#   per tier: TIER_HEADER, the open bucket's running (min, max, sum) per
+#   field as doubles, then `capacity` records of doubles: bucket start
+#   (epoch seconds) followed by (min, max, mean) per field. Records form a
+#   ring; the oldest is at `head` once `size` reaches `capacity`.
+HISTORY_MAGIC = b'UNEVHIST'
+HISTORY_VERSION = 1
+DEFAULT_HISTORY_FILE = os.path.join(
+    os.environ.get('XDG_STATE_HOME') or os.path.expanduser('~/.local/state'),
+    'unevictable-memory-chart', 'history.bin')
+FILE_ID = struct.Struct('<8sIII')  # the part that must match to resume
+FILE_HEADER = struct.Struct('<8sIIIq4x')
+FIELD_NAME = struct.Struct('<32s')
+# resolution, capacity, head, open bucket index (-1 if none), size, open bucket weight
+TIER_HEADER = struct.Struct('<dIIqII')
+
+
+def history_layout(tiers=HISTORY_TIERS, fields: Tuple[str, ...] = HISTORY_FIELDS) -> Tuple[int, List[int]]:
+    """Total history size in bytes and the offset of each tier's block"""
+    record = 8 * (1 + 3 * len(fields))
+    offset = FILE_HEADER.size + FIELD_NAME.size * len(fields)
+    offsets = []
+    for resolution, span in tiers:
+        offsets.append(offset)
+        offset += TIER_HEADER.size + 24 * len(fields) + int(span // resolution) * record
+    return offset, offsets
+
+
+class HistoryTier:
+    """Fixed-size ring of (min, max, mean) buckets per field at one resolution
+
+    All state, including the bucket still being filled, lives in `block`
+    (see the history file layout above), so a tier mapped from a file
+    resumes exactly where the previous run stopped.
+    """
+
+    def __init__(self, resolution: float, span: float, block: memoryview,
+                 fields: Tuple[str, ...] = HISTORY_FIELDS, fresh: bool = True):
+        self.resolution = resolution
+        self.span = span
+        self.capacity = int(span // resolution)
+        self.fields = fields
+        self.stride = 1 + 3 * len(fields)  # doubles per record
+        accumulators = TIER_HEADER.size + 24 * len(fields)
+        self.header = block[:TIER_HEADER.size]
+        self.open = block[TIER_HEADER.size:accumulators].cast('d')
+        self.records = block[accumulators:].cast('d')
+        if fresh:
+            self.head = self.size = self.weight = 0
+            self.index: Optional[int] = None
+            self._save()
+        else:
+            _, _, self.head, index, self.size, self.weight = TIER_HEADER.unpack(self.header)
+            self.index = None if index < 0 else index
+
+    def release(self):
+        """Drop the views into the history buffer so it can be unmapped"""
+        for view in (self.header, self.open, self.records):
+            view.release()
+
+    def _save(self):
+        TIER_HEADER.pack_into(self.header, 0, self.resolution, self.capacity, self.head,
+                              -1 if self.index is None else self.index, self.size, self.weight)
+
+    def add(self, t: float, lows: List[float], highs: List[float], means: List[float], weight: int = 1):
+        """Fold a sample (or a finer bucket) in; returns the bucket it closed, if any
+
+        Values are lists in `fields` order. The closed bucket comes back as
+        add()'s own arguments, ready to feed the next coarser tier.
+        """
+        index = int(t // self.resolution)
+        closed = None
+        if self.index is not None and index != self.index:
+            closed = self._close()
+        accumulators = self.open
+        if self.index != index:
+            self.index, self.weight = index, 0
+            for j in range(0, len(accumulators), 3):
+                accumulators[j], accumulators[j + 1], accumulators[j + 2] = math.inf, -math.inf, 0.0
+        self.weight += weight
+        for j, low, high, mean in zip(range(0, len(accumulators), 3), lows, highs, means):
+            if low < accumulators[j]:
+                accumulators[j] = low
+            if high > accumulators[j + 1]:
+                accumulators[j + 1] = high
+            accumulators[j + 2] += mean * weight
+        self._save()
+        return closed
+
+    def _close(self):
+        start = self.index * self.resolution
+        base = self.head * self.stride
+        records, accumulators = self.records, self.open
+        records[base] = start
+        lows, highs, means = [], [], []
+        for j in range(0, len(accumulators), 3):
+            low, high, mean = accumulators[j], accumulators[j + 1], accumulators[j + 2] / self.weight
+            records[base + 1 + j], records[base + 2 + j], records[base + 3 + j] = low, high, mean
+            lows.append(low)
+            highs.append(high)
+            means.append(mean)
+        self.head = (self.head + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+        return start, lows, highs, means, self.weight
+
+    def _column(self, offset: int) -> array:
+        """One record field for every stored bucket, oldest first"""
+        column = array('d')
+        column.frombytes(self.records[offset::self.stride].tobytes())
+        if self.size < self.capacity:
+            return column[:self.size]
+        return column[self.head:] + column[:self.head]
+
+    def view(self, field: str, since: float = 0.0) -> Tuple[array, array, array, array]:
+        """(times, mins, maxs, means) of buckets starting at or after `since`, oldest first
+
+        The open bucket is included so the newest sample shows immediately.
+        """
+        j = 3 * self.fields.index(field)
+        times = self._column(0)
+        series = [self._column(1 + j + stat) for stat in range(len(HISTORY_STATS))]
+        if self.index is not None:
+            times.append(self.index * self.resolution)
+            low, high, total = self.open[j], self.open[j + 1], self.open[j + 2]
+            for values, value in zip(series, (low, high, total / self.weight)):
+                values.append(value)
+        start = bisect_left(times, since)
+        return (times[start:], *(values[start:] for values in series))
+
+
+class TieredHistory:
+    """Multi-resolution history: each tier aggregates the buckets the finer one closes
+
+    With a `path` the tiers live in a memory-mapped file, so a restart
+    resumes the full history without reading it back: opening costs the
+    same for an empty file and a week of data. The file is locked against
+    a second writer; a file written with other tiers or fields is moved
+    aside to `<path>.old` (`discarded`) and a fresh one started. Other
+    tools can read it with struct or numpy.memmap using the layout above.
+    """
+
+    def __init__(self, tiers=HISTORY_TIERS, fields: Tuple[str, ...] = HISTORY_FIELDS,
+                 path: Optional[Path] = None):
+        self.fields = fields
+        self.tier_count = len(tiers)
+        self.path = path
+        self.discarded: Optional[Path] = None
+        self._fd: Optional[int] = None
+        size, offsets = history_layout(tiers, fields)
+        if path is None:
+            self.buffer, fresh = bytearray(size), True
+        else:
+            self.buffer, fresh = self._map(Path(path), size, tiers)
+        view = memoryview(self.buffer)
+        if fresh:
+            self.samples = 0
+            for i, field in enumerate(fields):
+                FIELD_NAME.pack_into(view, FILE_HEADER.size + i * FIELD_NAME.size, field.encode())
+        else:
+            self.samples = FILE_HEADER.unpack_from(view)[4]
+        self._save()
+        ends = offsets[1:] + [size]
+        self.tiers = [
+            HistoryTier(resolution, span, view[start:end], fields, fresh)
+            for (resolution, span), start, end in zip(tiers, offsets, ends)
+        ]
+
+    def _compatible(self, fd: int, size: int, tiers) -> bool:
+        """Whether an existing file was written with the same tiers and fields"""
+        if os.fstat(fd).st_size != size:
+            return False
+        header = os.pread(fd, FILE_HEADER.size + FIELD_NAME.size * len(self.fields), 0)
+        names = b''.join(FIELD_NAME.pack(field.encode()) for field in self.fields)
+        if (header[:FILE_ID.size] != FILE_ID.pack(HISTORY_MAGIC, HISTORY_VERSION, len(tiers), len(self.fields))
+                or header[FILE_HEADER.size:] != names):
+            return False
+        for (resolution, span), offset in zip(tiers, history_layout(tiers, self.fields)[1]):
+            stored = TIER_HEADER.unpack(os.pread(fd, TIER_HEADER.size, offset))
+            if stored[:2] != (resolution, int(span // resolution)):
+                return False
+        return True
+
+    def _map(self, path: Path, size: int, tiers) -> Tuple[mmap.mmap, bool]:
+        """Map the history file, creating or replacing it if needed; raises OSError"""
+        if sys.byteorder != 'little':
+            # Records are read and written as native doubles
+            raise OSError("history files are little-endian and this host is not")
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            fresh = os.fstat(fd).st_size == 0
+            if not fresh and not self._compatible(fd, size, tiers):
+                self.discarded = path.with_name(path.name + '.old')
+                os.replace(path, self.discarded)
+                os.close(fd)
+                fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                fresh = True
+            if fresh:
+                os.ftruncate(fd, size)
+            buffer = mmap.mmap(fd, size)
+        except BlockingIOError:
+            os.close(fd)
+            raise OSError(f"{path} is in use by another monitor")
+        except OSError:
+            os.close(fd)
+            raise
+        self._fd = fd  # held open to keep the lock
+        return buffer, fresh
+
+    def _save(self):
+        FILE_HEADER.pack_into(self.buffer, 0, HISTORY_MAGIC, HISTORY_VERSION,
+                              self.tier_count, len(self.fields), self.samples)
+
+    def add(self, t: float, values: Dict[str, float]):
+        values = [float(values[field]) for field in self.fields]
+        carry = (t, values, values, values, 1)
+        for tier in self.tiers:
+            carry = tier.add(*carry)
+            if carry is None:
+                break
+        self.samples += 1
+        self._save()
+
+    def view(self, field: str, tier: int, now: float) -> Tuple[array, array, array, array]:
+        """One tier's buckets for `field` over that tier's span, ending at `now`"""
+        return self.tiers[tier].view(field, now - self.tiers[tier].span)
+
+    def close(self):
+        """Write the mapped history back, unmap it and release the lock"""
+        if self._fd is not None:
+            for tier in self.tiers:
+                tier.release()
+            self.buffer.flush()
+            self.buffer.close()
+            os.close(self._fd)
+            self._fd = None
+
+
+def format_duration(seconds: float) -> str:
+    """Compact duration such as '6h', '10m' or '1h 5m 3s'"""
+    total = int(seconds)
+    parts = [(total // 86400, 'd'), (total % 86400 // 3600, 'h'),
+             (total % 3600 // 60, 'm'), (total % 60, 's')]
+    return ' '.join(f"{value}{unit}" for value, unit in parts if value) or '0s'
+
+
+class ChartView:
+    """Chart renderable that fills its panel and is redrawn only for new data or a resize"""
+
+    def __init__(self, tracker: 'UnevictableMemoryTracker', style: str = 'braille'):
+        self.tracker = tracker
+        self.style = style
+        self._key = None
+        self._text: Optional[Text] = None
+
+    def __rich_console__(self, console, options):
+        width = options.max_width
+        height = options.height or 25
+        key = (self.tracker.version, self.tracker.horizon, width, height)
+        if key != self._key:
+            # Title, rule, time axis and time labels take four lines
+            chart = self.tracker.create_ascii_chart(width, max(2, height - 4), self.style)
+            self._text = Text(chart, no_wrap=True, overflow='crop')
+            self._key = key
+        yield self._text
+
+
 class UnevictableMemoryTracker:
     """Tracks unevictable memory usage over time"""
     
-    def __init__(self, history_size: int = 100):
-        self.history_size = history_size
-        self.data_points = deque(maxlen=history_size)
+    def __init__(self, full_scan_every: int = 12, history: Optional[TieredHistory] = None):
+        # Numeric history at several resolutions (possibly resumed from a
+        # previous run); only the newest full sample is kept
+        self.history = history or TieredHistory()
+        self.horizon = 0  # index of the history tier on screen
+        self.latest: Optional[Dict[str, Any]] = None
+        self.version = 0  # bumped per data point, so views know when to redraw
         self.console = Console()
+        self._last_reclaim: Optional[Tuple[float, Dict[str, int]]] = None
+        # Adaptive mlocked-process scan: walk every PID only when the global
+        # Mlocked counter moved or every full_scan_every samples; otherwise
+        # re-read just the PIDs the last walk found locking memory
+        self.full_scan_every = max(1, full_scan_every)
+        self._mlocking_pids: Dict[int, str] = {}
+        self._scan_mlocked_kb: Optional[int] = None  # global Mlocked at the last walk
+        self._samples_since_scan = 0
+        # Collector health, shown in the footer
+        self.interval = 5.0
+        self.overruns = 0  # samples skipped because a collection ran past its slot
+        self.dropped = 0  # samples discarded because the renderer fell behind
+        self.chart_style = 'braille'
+        self._layout: Optional[Layout] = None
+        self._panel_keys: Dict[str, Any] = {}
+        
+    def _read_pressure(self, unevictable_info: Dict[str, Any]):
+        """Add memory PSI and per-second reclaim rates since the previous sample"""
+        stall_us = {'some': 0, 'full': 0}
+        try:
+            with open('/proc/pressure/memory', 'r') as f:
+                for line in f:
+                    kind, *fields = line.split()
+                    values = dict(field.split('=') for field in fields)
+                    unevictable_info[f'psi_{kind}_avg10'] = float(values['avg10'])
+                    stall_us[kind] = int(values['total'])
+        except (OSError, ValueError, KeyError):
+            pass  # kernel without CONFIG_PSI
+        
+        # pgscan/pgsteal over all reclaim paths (the _anon/_file split would
+        # double count), allocstall over all zones
+        counters = {'pgscan': 0, 'pgsteal': 0, 'allocstall': 0, 'compact_stall': 0,
+                    'full_stall_ms': stall_us['full'] / 1000}
+        try:
+            with open('/proc/vmstat', 'r') as f:
+                for line in f:
+                    key, value = line.split()
+                    for prefix in ('pgscan', 'pgsteal'):
+                        if key.startswith(prefix + '_') and key[len(prefix) + 1:] not in ('anon', 'file'):
+                            counters[prefix] += int(value)
+                    if key == 'allocstall' or key.startswith('allocstall_'):
+                        counters['allocstall'] += int(value)
+                    elif key == 'compact_stall':
+                        counters['compact_stall'] = int(value)
+        except (OSError, ValueError):
+            return
+        
+        now = time.monotonic()
+        if self._last_reclaim is not None:
+            then, previous = self._last_reclaim
+            elapsed = now - then
+            if elapsed > 0:
+                for key, value in counters.items():
+                    unevictable_info[f'{key}_rate'] = (value - previous[key]) / elapsed
+        self._last_reclaim = (now, counters)
+        
+    def _find_mlocked_processes(self, mlocked_kb: int) -> Tuple[List[Dict[str, Any]], str]:
+        """Processes with non-zero VmLck, and how they were found ('full' or 'cached')
+
+        mlocked processes are rare and long-lived, so between walks the
+        cached PIDs are enough: anything that starts or stops locking memory
+        moves Mlocked and triggers a walk on the next sample.
+        """
+        self._samples_since_scan += 1
+        if (mlocked_kb != self._scan_mlocked_kb
+                or self._samples_since_scan >= self.full_scan_every):
+            pids = [int(entry) for entry in os.listdir('/proc') if entry.isdigit()]
+            scan = 'full'
+            self._scan_mlocked_kb = mlocked_kb
+            self._samples_since_scan = 0
+        else:
+            pids = list(self._mlocking_pids)
+            scan = 'cached'
+        
+        self._mlocking_pids = {}
+        processes = []
+        for pid in pids:
+            status = read_vmlck(pid)
+            if status is None or status[1] == 0:
+                continue
+            name, mlocked = status
+            self._mlocking_pids[pid] = name
+            processes.append({'pid': pid, 'name': name, 'mlocked_mb': mlocked / 1024})
+        return processes, scan
         
     def collect_memory_data(self) -> Dict[str, Any]:
         """Collect current unevictable memory data"""
@@ -62,8 +510,17 @@ class UnevictableMemoryTracker:
             'nfs_unstable_mb': 0,
             'bounce_mb': 0,
             'writeback_tmp_mb': 0,
-            'processes_with_mlocked': []
+            'psi_some_avg10': 0.0,
+            'psi_full_avg10': 0.0,
+            'pgscan_rate': 0.0,
+            'pgsteal_rate': 0.0,
+            'allocstall_rate': 0.0,
+            'compact_stall_rate': 0.0,
+            'full_stall_ms_rate': 0.0,
+            'processes_with_mlocked': [],
+            'mlocked_scan': 'full'
         }
+        mlocked_kb = 0
         
         # Get detailed info from /proc/meminfo
         try:
@@ -72,7 +529,8 @@ class UnevictableMemoryTracker:
                     if line.startswith('Unevictable:'):
                         unevictable_info['total_unevictable_mb'] = int(line.split()[1]) / 1024
                     elif line.startswith('Mlocked:'):
-                        unevictable_info['mlocked_mb'] = int(line.split()[1]) / 1024
+                        mlocked_kb = int(line.split()[1])
+                        unevictable_info['mlocked_mb'] = mlocked_kb / 1024
                     elif line.startswith('KernelStack:'):
                         unevictable_info['kernel_stack_mb'] = int(line.split()[1]) / 1024
                     elif line.startswith('PageTables:'):
@@ -90,107 +548,72 @@ class UnevictableMemoryTracker:
         except Exception as e:
             # If we can't read detailed info, at least we have basic memory stats
             pass
+        
+        self._read_pressure(unevictable_info)
             
         # Find processes with mlocked memory
-        for proc in psutil.process_iter(['pid', 'name']):
-            try:
-                pid = proc.info['pid']
-                status_file = f'/proc/{pid}/status'
-                if os.path.exists(status_file):
-                    with open(status_file, 'r') as f:
-                        for line in f:
-                            if line.startswith('VmLck:'):
-                                mlocked_kb = int(line.split()[1])
-                                if mlocked_kb > 0:
-                                    unevictable_info['processes_with_mlocked'].append({
-                                        'pid': pid,
-                                        'name': proc.info['name'],
-                                        'mlocked_mb': mlocked_kb / 1024
-                                    })
-                                break
-            except (psutil.NoSuchProcess, psutil.AccessDenied, FileNotFoundError, ValueError):
-                continue
+        processes, scan = self._find_mlocked_processes(mlocked_kb)
+        unevictable_info['processes_with_mlocked'] = processes
+        unevictable_info['mlocked_scan'] = scan
                 
         return unevictable_info
     
     def add_data_point(self, data: Dict[str, Any]):
         """Add a new data point to the history"""
-        self.data_points.append(data)
+        self.history.add(data['timestamp'].timestamp(), data)
+        self.latest = data
+        self.version += 1
     
-    def create_ascii_chart(self, width: int = 80, height: int = 20) -> str:
-        """Create ASCII line chart of unevictable memory over time"""
-        if len(self.data_points) < 2:
-            return "Insufficient data for chart (need at least 2 points)"
-        
-        # Extract unevictable memory values
-        values = [point['total_unevictable_mb'] for point in self.data_points]
-        timestamps = [point['timestamp'] for point in self.data_points]
-        
-        # Normalize values to chart height
-        min_val = min(values)
-        max_val = max(values)
-        val_range = max_val - min_val if max_val > min_val else 1
+    def zoom(self, horizon: int):
+        """Show history tier `horizon` (0 is the finest)"""
+        self.horizon = min(max(horizon, 0), len(self.history.tiers) - 1)
+    
+    def horizon_label(self) -> str:
+        tier = self.history.tiers[self.horizon]
+        return f"last {format_duration(tier.span)} at {format_duration(tier.resolution)}"
+    
+    def _view(self, field: str = 'total_unevictable_mb'):
+        now = self.latest['timestamp'].timestamp() if self.latest else time.time()
+        return self.history.view(field, self.horizon, now)
+    
+    def create_ascii_chart(self, width: int = 80, height: int = 20, style: str = 'braille') -> str:
+        """Create a line (braille) or area (block) chart of unevictable memory over the horizon"""
+        times, lows, highs, means = self._view()
+        if len(times) < 2:
+            return f"Insufficient data for chart (need at least 2 points, {self.horizon_label()})"
+        
+        chart_width = max(2, width - 8)  # Leave space for Y-axis labels
+        # Braille packs two buckets into every character
+        buckets = column_buckets(lows, highs, means, chart_width * 2 if style == 'braille' else chart_width)
+        min_val = min(bucket[0] for bucket in buckets)
+        max_val = max(bucket[1] for bucket in buckets)
+        low, high = (min_val, max_val) if max_val > min_val else (min_val - 1, max_val + 1)
         
-        # Create the chart grid
         lines = []
-        
-        # Add title
-        title = f"Unevictable Memory Over Time ({min_val:.1f} - {max_val:.1f} MB)"
+        title = f"Unevictable Memory, {self.horizon_label()} ({min_val:.1f} - {max_val:.1f} MB)"
         lines.append(title.center(width))
         lines.append("─" * width)
         
-        # Create the chart
-        for row in range(height):
-            line_chars = []
-            threshold = min_val + (val_range * (height - row - 1) / (height - 1))
-            
-            # Y-axis label
-            y_label = f"{threshold:5.1f}│"
-            line_chars.append(y_label)
-            
-            # Plot points
-            chart_width = width - 8  # Leave space for Y-axis labels
-            for i in range(chart_width):
-                data_index = int((i / chart_width) * (len(values) - 1))
-                value = values[data_index]
-                
-                if abs(value - threshold) < (val_range / height):
-                    line_chars.append("●")
-                elif value > threshold and data_index < len(values) - 1:
-                    next_value = values[min(data_index + 1, len(values) - 1)]
-                    if next_value <= threshold:
-                        line_chars.append("╲")
-                    elif value > threshold:
-                        line_chars.append(" ")
-                elif value < threshold and data_index < len(values) - 1:
-                    next_value = values[min(data_index + 1, len(values) - 1)]
-                    if next_value >= threshold:
-                        line_chars.append("╱")
-                    else:
-                        line_chars.append(" ")
-                else:
-                    line_chars.append(" ")
-            
-            lines.append("".join(line_chars))
+        rasterize = rasterize_braille if style == 'braille' else rasterize_blocks
+        for row, cells in enumerate(rasterize(buckets, low, high, height)):
+            label = high - (high - low) * row / max(1, height - 1)
+            lines.append(f"{label:6.1f}│{cells}")
         
-        # Add time axis
+        # Time axis
         lines.append("      " + "└" + "─" * (chart_width - 1))
-        
-        # Add time labels
-        if timestamps:
-            start_time = timestamps[0].strftime("%H:%M:%S")
-            end_time = timestamps[-1].strftime("%H:%M:%S")
-            time_line = f"      {start_time}" + " " * (chart_width - len(start_time) - len(end_time) - 6) + end_time
-            lines.append(time_line)
+        time_format = "%m-%d %H:%M" if times[-1] - times[0] > 86400 else "%H:%M:%S"
+        start_time = datetime.fromtimestamp(times[0]).strftime(time_format)
+        end_time = (self.latest['timestamp'] if self.latest else datetime.fromtimestamp(times[-1])).strftime(time_format)
+        lines.append(f"      {start_time}" + " " * max(1, chart_width - len(start_time) - len(end_time)) + end_time)
         
         return "\n".join(lines)
     
     def create_detailed_breakdown_table(self) -> Table:
         """Create a table showing detailed breakdown of unevictable memory"""
-        if not self.data_points:
+        if self.latest is None:
             return Table()
             
-        latest = self.data_points[-1]
+        latest = self.latest
         
         table = Table(title="Unevictable Memory Breakdown", box=box.ROUNDED)
         table.add_column("Component", style="cyan", no_wrap=True)
@@ -226,10 +649,10 @@ class UnevictableMemoryTracker:
     
     def create_slab_info_table(self) -> Table:
         """Create a table showing slab memory information"""
-        if not self.data_points:
+        if self.latest is None:
             return Table()
             
-        latest = self.data_points[-1]
+        latest = self.latest
         
         table = Table(title="Slab Memory Information", box=box.ROUNDED)
         table.add_column("Type", style="cyan")
@@ -243,10 +666,10 @@ class UnevictableMemoryTracker:
     
     def create_process_table(self) -> Table:
         """Create a table showing processes with mlocked memory"""
-        if not self.data_points:
+        if self.latest is None:
             return Table()
             
-        latest = self.data_points[-1]
+        latest = self.latest
         processes = latest['processes_with_mlocked']
         
         if not processes:
@@ -271,10 +694,10 @@ class UnevictableMemoryTracker:
     
     def create_stats_panel(self) -> Panel:
         """Create a panel with current statistics"""
-        if not self.data_points:
+        if self.latest is None:
             return Panel("No data available", title="Statistics")
         
-        latest = self.data_points[-1]
+        latest = self.latest
         
         stats_text = f"""
 [bold cyan]System Memory:[/bold cyan]
@@ -285,42 +708,37 @@ class UnevictableMemoryTracker:
   Current: {latest['total_unevictable_mb']:.2f} MB
   % of Total: {(latest['total_unevictable_mb'] / latest['total_memory_mb'] * 100):.2f}%
 
+[bold red]Memory Pressure:[/bold red]
+  PSI some/full avg10: {latest['psi_some_avg10']:.2f}% / {latest['psi_full_avg10']:.2f}%
+  Full stall: {latest['full_stall_ms_rate']:.1f} ms/s
+  Reclaim: scan {latest['pgscan_rate']:.0f}/s, steal {latest['pgsteal_rate']:.0f}/s
+  Allocstall: {latest['allocstall_rate']:.1f}/s, compact stall: {latest['compact_stall_rate']:.1f}/s
+
 [bold green]Growth Tracking:[/bold green]
-  Data Points: {len(self.data_points)}
+  Samples: {self.history.samples}
+  Horizon: {self.horizon_label()} (keys 1-{len(self.history.tiers)} zoom)
+  Mlocked scan: {latest['mlocked_scan']} ({len(self._mlocking_pids)} locking PIDs cached)
   Time Span: {self._get_time_span()}
         """
         
-        if len(self.data_points) >= 2:
-            first_point = self.data_points[0]['total_unevictable_mb']
-            current_point = latest['total_unevictable_mb']
-            change = current_point - first_point
+        times, _, _, means = self._view()
+        if len(times) >= 2:
+            change = latest['total_unevictable_mb'] - means[0]
             stats_text += f"  Change: {change:+.2f} MB"
         
         return Panel(stats_text.strip(), title="Current Statistics", box=box.ROUNDED)
     
     def _get_time_span(self) -> str:
-        """Get the time span of collected data"""
-        if len(self.data_points) < 2:
+        """Get the time span of the data on screen"""
+        times = self._view()[0]
+        if len(times) < 2:
             return "N/A"
-        
-        start_time = self.data_points[0]['timestamp']
-        end_time = self.data_points[-1]['timestamp']
-        duration = end_time - start_time
-        
-        total_seconds = int(duration.total_seconds())
-        hours = total_seconds // 3600
-        minutes = (total_seconds % 3600) // 60
-        seconds = total_seconds % 60
-        
-        if hours > 0:
-            return f"{hours}h {minutes}m {seconds}s"
-        elif minutes > 0:
-            return f"{minutes}m {seconds}s"
-        else:
-            return f"{seconds}s"
+        return format_duration(self.latest['timestamp'].timestamp() - times[0])
     
     def create_layout(self) -> Layout:
-        """Create the main TUI layout"""
+        """Create the main TUI layout once; update_layout refreshes its panels"""
+        if self._layout is not None:
+            return self._layout
         layout = Layout()
         
         # Split into sections
@@ -341,63 +759,190 @@ class UnevictableMemoryTracker:
             Layout(name="processes")
         )
         
-        # Update content
         layout["header"].update(
             Panel(
                 Text("Unevictable Memory Monitor", style="bold blue", justify="center"),
                 box=box.SIMPLE
             )
         )
+        # The chart view redraws itself when the data or panel size changes
+        layout["chart"].update(Panel(ChartView(self, self.chart_style), title="Memory Chart", box=box.ROUNDED))
         
-        # Chart
-        chart_content = self.create_ascii_chart(width=80, height=25)
-        layout["chart"].update(Panel(chart_content, title="Memory Chart", box=box.ROUNDED))
-        
-        # Sidebar content
-        layout["stats"].update(self.create_stats_panel())
-        layout["breakdown"].update(self.create_detailed_breakdown_table())
-        layout["processes"].update(self.create_process_table())
-        
-        # Footer
-        footer_text = "[bold green]Press Ctrl+C to exit[/bold green] | [cyan]Data updated every 5 seconds[/cyan]"
-        layout["footer"].update(Panel(footer_text, box=box.SIMPLE))
-        
+        self._layout = layout
+        self.update_layout()
         return layout
+    
+    def update_layout(self):
+        """Rebuild only the sidebar and footer panels whose contents changed"""
+        layout = self.create_layout()
+        latest = self.latest or {}
+        panels = {
+            'stats': ((self.version, self.horizon), self.create_stats_panel),
+            'breakdown': (tuple(latest.get(key) for key in (
+                'total_unevictable_mb', 'mlocked_mb', 'kernel_stack_mb', 'page_tables_mb',
+                'nfs_unstable_mb', 'bounce_mb', 'writeback_tmp_mb')), self.create_detailed_breakdown_table),
+            'processes': (tuple((p['pid'], p['name'], p['mlocked_mb'])
+                                for p in latest.get('processes_with_mlocked', [])), self.create_process_table),
+            'footer': ((self.interval, self.overruns, self.dropped), self._create_footer),
+        }
+        for name, (key, create) in panels.items():
+            if self._panel_keys.get(name, object()) != key:
+                layout[name].update(create())
+                self._panel_keys[name] = key
+    
+    def _create_footer(self) -> Panel:
+        footer_text = (f"[bold green]Press Ctrl+C or q to exit[/bold green] | "
+                       f"[cyan]1-{len(self.history.tiers)} or +/- to zoom[/cyan] | "
+                       f"[cyan]Data updated every {self.interval:g} seconds[/cyan] | "
+                       f"overruns {self.overruns}, dropped {self.dropped}")
+        return Panel(footer_text, box=box.SIMPLE)
+
+
+# Samples waiting for the renderer; the oldest is dropped when full so a
+# stalled screen never blocks collection
+QUEUE_SIZE = 256
+
+
+async def collect_samples(tracker: UnevictableMemoryTracker, queue: asyncio.Queue,
+                          executor: ThreadPoolExecutor, interval: float, stop: asyncio.Event):
+    """Collect on a fixed schedule in a worker thread and queue the samples
+
+    Deadlines are absolute, so collection time does not add drift; a
+    collection that runs past one or more deadlines skips them rather than
+    firing a burst of catch-up samples.
+    """
+    loop = asyncio.get_running_loop()
+    start = time.monotonic()
+    tick = 0
+    while not stop.is_set():
+        data = await loop.run_in_executor(executor, tracker.collect_memory_data)
+        if queue.full():
+            queue.get_nowait()
+            tracker.dropped += 1
+        queue.put_nowait(data)
+        
+        tick += 1
+        next_tick = max(tick, int((time.monotonic() - start) / interval) + 1)
+        tracker.overruns += next_tick - tick
+        tick = next_tick
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=max(0.0, start + tick * interval - time.monotonic()))
+        except asyncio.TimeoutError:
+            pass
+
+
+async def render(tracker: UnevictableMemoryTracker, queue: asyncio.Queue, live: Live,
+                 refresh: float, stop: asyncio.Event):
+    """Fold queued samples into the history and redraw on the refresh cadence"""
+    while not stop.is_set():
+        updated = False
+        while not queue.empty():
+            tracker.add_data_point(queue.get_nowait())
+            updated = True
+        if updated:
+            tracker.update_layout()
+            live.refresh()
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=refresh)
+        except asyncio.TimeoutError:
+            pass
+
+
+def handle_keys(tracker: UnevictableMemoryTracker, live: Live, stop: asyncio.Event, keys: str):
+    """Number keys pick a history horizon, +/- zoom in and out, q quits"""
+    for key in keys:
+        if key.isdigit() and 1 <= int(key) <= len(tracker.history.tiers):
+            tracker.zoom(int(key) - 1)
+        elif key in '+=':
+            tracker.zoom(tracker.horizon - 1)
+        elif key in '-_':
+            tracker.zoom(tracker.horizon + 1)
+        elif key in 'qQ':
+            stop.set()
+    # Every tier is already in memory, so the new horizon draws immediately
+    tracker.update_layout()
+    live.refresh()
 
 
 async def main():
     """Main application entry point"""
     parser = argparse.ArgumentParser(description="Unevictable Memory TUI Chart")
-    parser.add_argument('--interval', '-i', type=int, default=5,
-                       help='Update interval in seconds (default: 5)')
-    parser.add_argument('--history', type=int, default=200,
-                       help='Number of data points to keep in history (default: 200)')
+    parser.add_argument('--interval', '-i', type=float, default=5,
+                       help='Update interval in seconds, fractions allowed (default: 5)')
+    parser.add_argument('--refresh', type=float, default=1.0,
+                       help='Screen refresh interval in seconds (default: 1)')
+    parser.add_argument('--chart-style', choices=CHART_STYLES, default='braille',
+                       help='braille line (2x4 dots per cell) or block area chart (default: braille)')
+    parser.add_argument('--horizon', type=int, choices=range(1, len(HISTORY_TIERS) + 1), default=1,
+                       help='History tier shown at start: ' + ', '.join(
+                           f"{n}={format_duration(span)} at {format_duration(resolution)}"
+                           for n, (resolution, span) in enumerate(HISTORY_TIERS, 1)) + ' (default: 1)')
+    parser.add_argument('--full-scan-every', type=int, default=12,
+                       help='Walk every process for mlocked memory at least every N samples; '
+                            'in between only known mlocking PIDs are re-read unless Mlocked changes (default: 12)')
+    parser.add_argument('--history-file', default=DEFAULT_HISTORY_FILE,
+                       help=f'Memory-mapped history file, resumed on restart (default: {DEFAULT_HISTORY_FILE})')
+    parser.add_argument('--no-history-file', action='store_true',
+                       help='Keep history in memory only')
     
     args = parser.parse_args()
-    
-    tracker = UnevictableMemoryTracker(history_size=args.history)
+    if args.interval <= 0 or args.refresh <= 0:
+        parser.error("--interval and --refresh must be greater than 0")
     
     console = Console()
     console.print("[bold green]Starting Unevictable Memory Monitor...[/bold green]")
     
+    history = None
+    if not args.no_history_file:
+        try:
+            history = TieredHistory(path=Path(args.history_file).expanduser())
+        except OSError as e:
+            console.print(f"[bold yellow]History kept in memory only: {e}[/bold yellow]")
+        else:
+            if history.discarded:
+                console.print(f"[bold yellow]History file layout changed; old file kept as "
+                              f"{history.discarded}[/bold yellow]")
+            elif history.samples:
+                console.print(f"Resuming {history.samples} samples from {history.path}")
+    
+    tracker = UnevictableMemoryTracker(full_scan_every=args.full_scan_every, history=history)
+    tracker.zoom(args.horizon - 1)
+    tracker.interval = args.interval
+    tracker.chart_style = args.chart_style
+    
+    # Ctrl+C only sets the stop event, so both tasks wind down between steps
+    # instead of being torn down mid-draw
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    loop.add_signal_handler(signal.SIGINT, stop.set)
+    loop.add_signal_handler(signal.SIGTERM, stop.set)
+    executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='collector')
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    # Keys arrive unbuffered in cbreak mode, which still turns Ctrl+C into SIGINT
+    stdin = sys.stdin.fileno() if sys.stdin.isatty() else None
+    saved_tty = termios.tcgetattr(stdin) if stdin is not None else None
+    
     try:
-        with Live(tracker.create_layout(), refresh_per_second=1, console=console) as live:
-            while True:
-                # Collect new data
-                data = tracker.collect_memory_data()
-                tracker.add_data_point(data)
-                
-                # Update the display
-                live.update(tracker.create_layout())
-                
-                # Wait for next update
-                await asyncio.sleep(args.interval)
-                
-    except KeyboardInterrupt:
+        with Live(tracker.create_layout(), auto_refresh=False, console=console) as live:
+            if stdin is not None:
+                tty.setcbreak(stdin)
+                loop.add_reader(stdin, lambda: handle_keys(
+                    tracker, live, stop, os.read(stdin, 32).decode('utf-8', 'ignore')))
+            await asyncio.gather(
+                collect_samples(tracker, queue, executor, args.interval, stop),
+                render(tracker, queue, live, args.refresh, stop)
+            )
         console.print("\n[bold yellow]Monitor stopped by user[/bold yellow]")
     except Exception as e:
         console.print(f"\n[bold red]Error: {e}[/bold red]")
         raise
+    finally:
+        if stdin is not None:
+            loop.remove_reader(stdin)
+            termios.tcsetattr(stdin, termios.TCSADRAIN, saved_tty)
+        # A collection still in flight finishes in the background
+        executor.shutdown(wait=False)
+        tracker.history.close()
 
 
 if __name__ == "__main__":